@@ -3,11 +3,24 @@ Dental Market Intelligence Dashboard
 Run: streamlit run dashboards/client_dashboard.py
 """
 
+import hashlib
+import io
 import os
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import pyarrow as pa
+import plotly.graph_objects as go
+import plotly.io as pio
+
+try:
+    import fastnumbers
+except ImportError:  # optional - only speeds up the non-Arrow fetch fallback
+    fastnumbers = None
 
 # Only US states (50) + DC
 US_STATES_ONLY = ('AL','AK','AZ','AR','CA','CO','CT','DE','FL','GA','HI','ID','IL','IN','IA',
@@ -15,6 +28,10 @@ US_STATES_ONLY = ('AL','AK','AZ','AR','CA','CO','CT','DE','FL','GA','HI','ID','I
                   'NM','NY','NC','ND','OH','OK','OR','PA','RI','SC','SD','TN','TX','UT','VT',
                   'VA','WA','WV','WI','WY','DC')
 
+# Queries semi-join against the CLEAN.US_STATES reference table, which holds the same list
+# (created by sql/dental/create_schema.sql; existing deployments run sql/setup/us_states.sql)
+US_STATES_FILTER = "SELECT STATE FROM CLEAN.US_STATES"
+
 STATE_NAMES = {
     'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
     'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware', 'FL': 'Florida', 'GA': 'Georgia',
@@ -29,6 +46,79 @@ STATE_NAMES = {
     'DC': 'District of Columbia'
 }
 
+# V_MARKET_OPPORTUNITY segment labels
+MARKET_TYPES = ('High Growth', 'Growing', 'Established', 'Mid-Size', 'Emerging')
+
+# Column labels for each load_data() frame, in SELECT order, and the numeric subset
+FRAME_COLUMNS = {
+    'state_insights': ['STATE', 'TOTAL_DENTISTS', 'FEMALE_DENTISTS', 'FEMALE_PCT',
+                       'NEW_PRACTICES', 'GROWTH_PRACTICES', 'ESTABLISHED_PRACTICES',
+                       'INNOVATION_READY_PCT', 'ZIP_COUNT', 'CITY_COUNT'],
+    'county_density': ['STATE', 'COUNTY', 'STATE_COUNTY', 'PROVIDER_COUNT', 'NEW_PRACTICE_COUNT', 'INNOVATION_SCORE'],
+    'county_export': ['STATE', 'COUNTY', 'STATE_COUNTY', 'PROVIDER_COUNT', 'NEW_PRACTICE_COUNT', 'INNOVATION_SCORE'],
+    'orgs': ['GRAIN', 'STATE', 'CITY', 'ORG_COUNT', 'NEW_ORGS', 'INNOVATION_SCORE'],
+    'market_opp': ['CITY', 'STATE', 'MARKET', 'TOTAL_PROVIDERS', 'NEW_PRACTICES', 'NEW_PRACTICE_PCT', 'FEMALE_PCT', 'MARKET_TYPE'],
+    'specialty_national': ['SPECIALTY', 'PROVIDER_COUNT'],
+    'stats': ['decision_makers', 'counties'],
+}
+
+# Upper bound for downcasting a count column to int32
+INT32_MAX = 2**31 - 1
+
+# Numeric columns per frame as (counts, percentages). The split is declared rather than
+# inferred, so each column gets the same dtype on every load whatever values it holds
+NUMERIC_COLUMNS = {
+    'state_insights': (['TOTAL_DENTISTS', 'FEMALE_DENTISTS', 'NEW_PRACTICES', 'GROWTH_PRACTICES',
+                        'ESTABLISHED_PRACTICES', 'ZIP_COUNT', 'CITY_COUNT'],
+                       ['FEMALE_PCT', 'INNOVATION_READY_PCT']),
+    'county_density': (['PROVIDER_COUNT', 'NEW_PRACTICE_COUNT'], ['INNOVATION_SCORE']),
+    'orgs': (['ORG_COUNT', 'NEW_ORGS'], ['INNOVATION_SCORE']),
+    'market_opp': (['TOTAL_PROVIDERS', 'NEW_PRACTICES'], ['NEW_PRACTICE_PCT', 'FEMALE_PCT']),
+    'specialty_national': (['PROVIDER_COUNT'], []),
+    'stats': (['decision_makers', 'counties'], []),
+}
+
+# Top counties by provider count. The dashboard only ever shows 100, so load_data()
+# fetches that many; the 500-row CSV export is fetched separately, on demand.
+COUNTY_DENSITY_SQL = """
+    SELECT STATE, COUNTY, STATE_COUNTY, PROVIDER_COUNT, NEW_PRACTICE_COUNT, INNOVATION_SCORE
+    FROM CLEAN.V_COUNTY_DENSITY ORDER BY PROVIDER_COUNT DESC LIMIT {limit}
+"""
+
+# Organization rollups at both grains from a single V_ORGANIZATIONS scan: the per-state
+# rows re-aggregate the per-city groups, and GRAIN tags which frame each row belongs to
+ORGS_SQL = f"""
+    WITH by_city AS (
+        SELECT STATE, CITY, COUNT(*) as ORG_COUNT,
+               COUNT_IF(PRACTICE_AGE_COHORT IN ('Very New (0-2 yrs)', 'New (2-5 yrs)')) as NEW_ORGS
+        FROM CLEAN.V_ORGANIZATIONS WHERE STATE IN ({US_STATES_FILTER})
+        GROUP BY STATE, CITY
+    ),
+    top_cities AS (
+        SELECT * FROM by_city WHERE ORG_COUNT >= 3 ORDER BY ORG_COUNT DESC LIMIT 20
+    )
+    SELECT 'state' as GRAIN, STATE, NULL as CITY, SUM(ORG_COUNT) as ORG_COUNT, SUM(NEW_ORGS) as NEW_ORGS,
+           ROUND(SUM(NEW_ORGS) * 100.0 / NULLIF(SUM(ORG_COUNT), 0), 1) as INNOVATION_SCORE
+    FROM by_city GROUP BY STATE
+    UNION ALL
+    SELECT 'city', STATE, CITY, ORG_COUNT, NEW_ORGS,
+           ROUND(NEW_ORGS * 100.0 / NULLIF(ORG_COUNT, 0), 1)
+    FROM top_cities
+    ORDER BY ORG_COUNT DESC
+"""
+
+# Applied to every dashboard session: keep result-cache reuse on (an account or
+# user default could disable it) and tag queries for warehouse cost attribution
+SESSION_PARAMETERS = {
+    'USE_CACHED_RESULT': True,
+    'QUERY_TAG': 'dental_dashboard',
+}
+
+# Local parquet snapshots of query results - the V_* views refresh weekly at most,
+# so repeat sessions can skip Snowflake entirely within the TTL
+CACHE_DIR = Path(os.getenv('DASHBOARD_CACHE_DIR', Path(__file__).parent / '.cache'))
+CACHE_TTL_SECONDS = int(os.getenv('DASHBOARD_CACHE_TTL', 24 * 60 * 60))
+
 # Page config - no sidebar
 st.set_page_config(
     page_title="Dental Market Intelligence",
@@ -37,116 +127,15 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# OpenAI-inspired Modern Dark Theme
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    
-    /* Base - OpenAI dark theme */
-    html, body, [class*="css"] { 
-        font-family: 'Inter', -apple-system, sans-serif;
-        background-color: #0d0d0d !important;
-    }
-    .main > div { background-color: #0d0d0d; }
-    
-    /* Header - subtle */
-    .main-header {
-        background: linear-gradient(135deg, #1a1a1a 0%, #2d2d2d 100%);
-        padding: 2rem; border-radius: 16px; margin-bottom: 1.5rem; color: white;
-        border: 1px solid rgba(255,255,255,0.1);
-    }
-    .main-header h1 { font-size: 2rem; font-weight: 600; margin-bottom: 0.3rem; }
-    .main-header p { color: rgba(255,255,255,0.6); font-size: 0.95rem; }
-    
-    /* Section headers */
-    .section-header {
-        font-size: 1.1rem; font-weight: 600; color: #ffffff;
-        margin-top: 1.5rem; margin-bottom: 1rem; padding-bottom: 0.5rem;
-        border-bottom: 1px solid rgba(255,255,255,0.1);
-    }
-    
-    /* Insight boxes - OpenAI green accent */
-    .insight-box {
-        background: rgba(16, 163, 127, 0.1);
-        border-radius: 8px; padding: 1rem; margin: 0.75rem 0;
-        border-left: 3px solid #10a37f;
-        color: rgba(255,255,255,0.8);
-        font-size: 0.9rem;
-    }
-    
-    /* TABS - Clean dark with hover lift */
-    .stTabs [data-baseweb="tab-list"] { 
-        gap: 8px; 
-        background: rgba(255,255,255,0.03);
-        padding: 8px;
-        border-radius: 12px;
-    }
-    
-    .stTabs [data-baseweb="tab"] { 
-        height: 48px !important; 
-        padding: 0 20px !important; 
-        font-size: 0.9rem !important; 
-        font-weight: 600 !important;
-        border-radius: 8px !important;
-        border: none !important;
-        background: rgba(255,255,255,0.05) !important;
-        color: rgba(255,255,255,0.7) !important;
-        transition: all 0.2s ease !important;
-    }
-    
-    .stTabs [data-baseweb="tab"]:hover {
-        transform: translateY(-2px) !important;
-        background: rgba(255,255,255,0.1) !important;
-        color: white !important;
-    }
-    
-    .stTabs [aria-selected="true"] { 
-        background: #10a37f !important;
-        color: white !important;
-        transform: translateY(-2px) !important;
-        box-shadow: 0 4px 12px rgba(16, 163, 127, 0.3) !important;
-    }
-    
-    .stTabs [data-baseweb="tab-highlight"] { display: none !important; }
-    .stTabs [data-baseweb="tab-border"] { display: none !important; }
-    
-    /* Sidebar */
-    [data-testid="stSidebar"] { background: #0d0d0d !important; border-right: 1px solid rgba(255,255,255,0.1); }
-    [data-testid="stSidebar"] * { color: rgba(255,255,255,0.8) !important; }
-    
-    /* Charts transparent */
-    .stPlotlyChart { background: transparent !important; }
-    [data-testid="stMetric"] { background: transparent !important; }
-    
-    /* DataFrame */
-    .stDataFrame { background: rgba(255,255,255,0.02) !important; border-radius: 8px !important; }
-    
-    /* Buttons - OpenAI green */
-    .stDownloadButton button {
-        background: #10a37f !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 6px !important;
-        font-weight: 500 !important;
-    }
-    .stDownloadButton button:hover { background: #0d8a6a !important; }
-    
-    /* Selectbox */
-    [data-testid="stSelectbox"] > div { background: rgba(255,255,255,0.05) !important; border-radius: 8px !important; }
-    
-    hr { border-color: rgba(255,255,255,0.08) !important; }
-    
-    /* KPI cards - subtle */
-    .kpi-row { display: flex; gap: 12px; margin-bottom: 1rem; }
-    .kpi-card {
-        background: rgba(255,255,255,0.03);
-        border: 1px solid rgba(255,255,255,0.08);
-        border-radius: 8px; padding: 12px 16px; text-align: center; flex: 1;
-    }
-    .kpi-value { font-size: 1.4rem; font-weight: 600; color: white; }
-    .kpi-label { font-size: 0.75rem; color: rgba(255,255,255,0.5); text-transform: uppercase; letter-spacing: 0.5px; }
-</style>
-""", unsafe_allow_html=True)
+# OpenAI-inspired Modern Dark Theme - kept in static/client_dashboard.css and read once per
+# process rather than rebuilt as a 4KB literal on every script rerun
+@st.cache_resource(show_spinner=False)
+def load_stylesheet():
+    """Read the dashboard stylesheet into a <style> block"""
+    return f"<style>{(Path(__file__).parent / 'static' / 'client_dashboard.css').read_text()}</style>"
+
+
+st.markdown(load_stylesheet(), unsafe_allow_html=True)
 
 
 def check_password():
@@ -175,8 +164,9 @@ def check_password():
     return False
 
 
-def get_snowflake_connection():
-    """Get Snowflake connection - supports RSA key auth and password auth"""
+@st.cache_resource(show_spinner=False)
+def connect_snowflake():
+    """Open a long-lived Snowflake connection - supports RSA key auth and password auth"""
     import snowflake.connector
     
     # Try Streamlit secrets first (for Streamlit Cloud and local)
@@ -208,7 +198,10 @@ def get_snowflake_connection():
                     private_key=private_key_bytes,
                     warehouse=sf.warehouse,
                     database=sf.database,
-                    schema=sf.get('schema', 'CLEAN')
+                    schema=sf.get('schema', 'CLEAN'),
+                    client_session_keep_alive=True,
+                    network_timeout=60,
+                    session_parameters=SESSION_PARAMETERS
                 )
             else:
                 # Fall back to password auth
@@ -218,7 +211,10 @@ def get_snowflake_connection():
                     password=sf.password,
                     warehouse=sf.warehouse,
                     database=sf.database,
-                    schema=sf.get('schema', 'CLEAN')
+                    schema=sf.get('schema', 'CLEAN'),
+                    client_session_keep_alive=True,
+                    network_timeout=60,
+                    session_parameters=SESSION_PARAMETERS
                 )
     except Exception as e:
         # If secrets exist but connection failed, raise the error
@@ -236,123 +232,561 @@ def get_snowflake_connection():
         password=password,
         warehouse=os.getenv('SNOWFLAKE_WAREHOUSE', 'COMPUTE_WH'),
         database=os.getenv('SNOWFLAKE_DATABASE', 'DENTAL_LEADS'),
-        schema=os.getenv('SNOWFLAKE_SCHEMA', 'CLEAN')
+        schema=os.getenv('SNOWFLAKE_SCHEMA', 'CLEAN'),
+        client_session_keep_alive=True,
+        network_timeout=60,
+        session_parameters=SESSION_PARAMETERS
     )
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def load_data():
-    """Load data from Snowflake"""
-    us_states_sql = "','".join(US_STATES_ONLY)
+def is_alive(conn):
+    """Cheap health check for a cached connection"""
+    if conn.is_closed():
+        return False
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT 1", timeout=5)
+        finally:
+            cursor.close()
+        return True
+    except Exception:
+        return False
+
+
+def get_snowflake_connection():
+    """Get the shared Snowflake connection, reconnecting if it has gone stale"""
+    conn = connect_snowflake()
+    if not is_alive(conn):
+        connect_snowflake.clear()
+        conn = connect_snowflake()
+    return conn
+
+
+def coerce_numeric(values):
+    """errors='coerce' numeric conversion for an object column built from fetchall()"""
+    if fastnumbers is None:
+        return pd.to_numeric(values, errors='coerce')
+    return pd.Series(fastnumbers.try_real(values, on_fail=float('nan'), map=list), index=values.index)
+
+
+def fetch_frame(cursor, columns):
+    """Fetch the current result set as a typed DataFrame via Arrow"""
+    from snowflake.connector.errors import NotSupportedError
     
-    conn = get_snowflake_connection()
-    if conn is None:
-        raise Exception("Could not establish Snowflake connection")
+    try:
+        # One Arrow table for the whole result, relabelled and converted to pandas in a
+        # single pass - no per-batch DataFrames to concat
+        table = cursor.fetch_arrow_all()
+    except NotSupportedError:
+        # Connector installed without the Arrow result format - build from tuples;
+        # fill_numeric() coerces the resulting object columns
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+    # Empty result sets return no table
+    if table is None:
+        return pd.DataFrame(columns=columns)
+    return table.rename_columns(columns).to_pandas()
+
+
+def fill_numeric(df, count_cols, pct_cols):
+    """Coerce, zero-fill and downcast numeric columns in one bulk assignment per frame"""
+    num_cols = count_cols + pct_cols
+    # Arrow already yields int64/float64; only the fetchall() fallback and empty
+    # results arrive as object and need coercing
+    untyped = df[num_cols].select_dtypes(include='object').columns
+    if len(untyped):
+        df[untyped] = df[untyped].apply(coerce_numeric)
+    filled = df[num_cols].fillna(0)
+    # Counts fit int32 and percentages float32 - halves the cached frames and the
+    # typed arrays Plotly and st.dataframe ship to the browser. Counts that held nulls
+    # arrive as float64 and go back to integers here; int64 only guards against overflow
+    dtypes = {col: 'int64' if filled[col].max() > INT32_MAX else 'int32' for col in count_cols}
+    dtypes.update(dict.fromkeys(pct_cols, 'float32'))
+    df[num_cols] = filled.astype(dtypes)
+
+
+def run_query(conn, sql, columns):
+    """Run one query on its own cursor and return its frame"""
     cursor = conn.cursor()
-    
     try:
-        # State insights
-        cursor.execute(f"SELECT * FROM CLEAN.V_STATE_INSIGHTS WHERE STATE IN ('{us_states_sql}')")
-        state_insights = pd.DataFrame(cursor.fetchall(), 
-            columns=['STATE', 'TOTAL_DENTISTS', 'FEMALE_DENTISTS', 'FEMALE_PCT', 
-                    'NEW_PRACTICES', 'GROWTH_PRACTICES', 'ESTABLISHED_PRACTICES',
-                    'INNOVATION_READY_PCT', 'ZIP_COUNT', 'CITY_COUNT'])
-        for col in ['TOTAL_DENTISTS', 'FEMALE_DENTISTS', 'FEMALE_PCT', 'NEW_PRACTICES', 
-                   'GROWTH_PRACTICES', 'ESTABLISHED_PRACTICES', 'INNOVATION_READY_PCT', 
-                   'ZIP_COUNT', 'CITY_COUNT']:
-            state_insights[col] = pd.to_numeric(state_insights[col], errors='coerce').fillna(0)
-        
-        # County density
-        cursor.execute("SELECT * FROM CLEAN.V_COUNTY_DENSITY ORDER BY PROVIDER_COUNT DESC LIMIT 500")
-        county_density = pd.DataFrame(cursor.fetchall(),
-            columns=['STATE', 'COUNTY', 'STATE_COUNTY', 'PROVIDER_COUNT', 'NEW_PRACTICE_COUNT', 'INNOVATION_SCORE'])
-        for col in ['PROVIDER_COUNT', 'NEW_PRACTICE_COUNT', 'INNOVATION_SCORE']:
-            county_density[col] = pd.to_numeric(county_density[col], errors='coerce').fillna(0)
-        
-        # City density
-        cursor.execute(f"SELECT * FROM CLEAN.V_CITY_DENSITY WHERE STATE IN ('{us_states_sql}') ORDER BY PROVIDER_COUNT DESC LIMIT 100")
-        city_density = pd.DataFrame(cursor.fetchall(),
-            columns=['CITY', 'STATE', 'CITY_STATE', 'PROVIDER_COUNT', 'FEMALE_COUNT', 
-                    'FEMALE_PCT', 'NEW_PRACTICE_COUNT', 'MID_PRACTICE_COUNT', 'ESTABLISHED_COUNT'])
-        for col in ['PROVIDER_COUNT', 'FEMALE_COUNT', 'FEMALE_PCT', 'NEW_PRACTICE_COUNT', 
-                   'MID_PRACTICE_COUNT', 'ESTABLISHED_COUNT']:
-            city_density[col] = pd.to_numeric(city_density[col], errors='coerce').fillna(0)
-        
-        # Organizations by state
-        cursor.execute(f"""
-            SELECT STATE, COUNT(*) as ORG_COUNT,
-                   COUNT(CASE WHEN PRACTICE_AGE_COHORT IN ('Very New (0-2 yrs)', 'New (2-5 yrs)') THEN 1 END) as NEW_ORGS,
-                   ROUND(COUNT(CASE WHEN PRACTICE_AGE_COHORT IN ('Very New (0-2 yrs)', 'New (2-5 yrs)') THEN 1 END) * 100.0 / NULLIF(COUNT(*), 0), 1) as INNOVATION_SCORE
-            FROM CLEAN.V_ORGANIZATIONS WHERE STATE IN ('{us_states_sql}')
-            GROUP BY STATE ORDER BY ORG_COUNT DESC
-        """)
-        org_by_state = pd.DataFrame(cursor.fetchall(), columns=['STATE', 'ORG_COUNT', 'NEW_ORGS', 'INNOVATION_SCORE'])
-        for col in ['ORG_COUNT', 'NEW_ORGS', 'INNOVATION_SCORE']:
-            org_by_state[col] = pd.to_numeric(org_by_state[col], errors='coerce').fillna(0)
-        
-        # Organizations by city
-        cursor.execute(f"""
-            SELECT STATE, CITY, COUNT(*) as ORG_COUNT,
-                   COUNT(CASE WHEN PRACTICE_AGE_COHORT IN ('Very New (0-2 yrs)', 'New (2-5 yrs)') THEN 1 END) as NEW_ORGS,
-                   ROUND(COUNT(CASE WHEN PRACTICE_AGE_COHORT IN ('Very New (0-2 yrs)', 'New (2-5 yrs)') THEN 1 END) * 100.0 / NULLIF(COUNT(*), 0), 1) as INNOVATION_SCORE
-            FROM CLEAN.V_ORGANIZATIONS WHERE STATE IN ('{us_states_sql}')
-            GROUP BY STATE, CITY HAVING COUNT(*) >= 3
-            ORDER BY ORG_COUNT DESC LIMIT 200
-        """)
-        organizations = pd.DataFrame(cursor.fetchall(), columns=['STATE', 'CITY', 'ORG_COUNT', 'NEW_ORGS', 'INNOVATION_SCORE'])
-        for col in ['ORG_COUNT', 'NEW_ORGS', 'INNOVATION_SCORE']:
-            organizations[col] = pd.to_numeric(organizations[col], errors='coerce').fillna(0)
-        
-        # Market opportunity
-        cursor.execute(f"SELECT * FROM CLEAN.V_MARKET_OPPORTUNITY WHERE STATE IN ('{us_states_sql}') ORDER BY NEW_PRACTICE_PCT DESC LIMIT 200")
-        market_opp = pd.DataFrame(cursor.fetchall(),
-            columns=['CITY', 'STATE', 'MARKET', 'TOTAL_PROVIDERS', 'NEW_PRACTICES', 'NEW_PRACTICE_PCT', 'FEMALE_PCT', 'MARKET_TYPE'])
-        for col in ['TOTAL_PROVIDERS', 'NEW_PRACTICES', 'NEW_PRACTICE_PCT', 'FEMALE_PCT']:
-            market_opp[col] = pd.to_numeric(market_opp[col], errors='coerce').fillna(0)
-        
-        # Specialty
-        cursor.execute(f"""
-            SELECT * FROM CLEAN.V_SPECIALTY_BY_STATE 
-            WHERE STATE IN (SELECT STATE FROM CLEAN.V_STATE_INSIGHTS WHERE STATE IN ('{us_states_sql}') ORDER BY TOTAL_DENTISTS DESC LIMIT 10)
-        """)
-        specialty = pd.DataFrame(cursor.fetchall(), columns=['STATE', 'SPECIALTY', 'PROVIDER_COUNT'])
-        specialty['PROVIDER_COUNT'] = pd.to_numeric(specialty['PROVIDER_COUNT'], errors='coerce').fillna(0)
-        
-        # Stats
-        cursor.execute(f"""
+        cursor.execute(sql)
+        return fetch_frame(cursor, columns)
+    finally:
+        # Connection is shared via st.cache_resource - only release the cursor
+        cursor.close()
+
+
+def cached_frame_path(key, sql):
+    """Snapshot path for a query - the SQL digest in the name means any edit to the
+    query text (filters, limits, the state list) misses the old snapshot"""
+    digest = hashlib.sha1(sql.encode('utf-8')).hexdigest()[:12]
+    return CACHE_DIR / f"{key}-{digest}.parquet"
+
+
+def read_cached_frame(key, sql):
+    """Return the parquet snapshot for a query if it is still fresh, else None"""
+    path = cached_frame_path(key, sql)
+    if not path.exists() or time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+        return None
+    try:
+        df = pd.read_parquet(path, engine='pyarrow')
+    except (OSError, pa.ArrowInvalid):
+        # Unreadable snapshot (truncated, mid-replace) - treat it as a miss and re-query
+        return None
+    # Snapshots written before a frame's labels changed are treated as stale
+    if list(df.columns) != FRAME_COLUMNS[key]:
+        return None
+    return df
+
+
+def write_cached_frame(key, sql, df):
+    """Snapshot a query result to parquet (best effort - cloud hosts may be read-only)"""
+    path = cached_frame_path(key, sql)
+    tmp_path = None
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename it into place, so readers (and a crash
+        # mid-write) never see a partial snapshot at the final path
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=f".{key}-", suffix='.tmp')
+        os.close(fd)
+        df.to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False)
+        os.replace(tmp_path, path)
+        tmp_path = None
+        # Drop snapshots left behind by earlier versions of the query
+        for stale in CACHE_DIR.glob(f"{key}-*.parquet"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+    finally:
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+
+
+# cache_resource hands every rerun the same dict instead of unpickling a fresh copy of
+# every frame on each hit - render code must treat data[...] as read-only
+@st.cache_resource(ttl=3600, show_spinner=False)
+def load_data():
+    """Load data from the local parquet snapshot, falling back to Snowflake"""
+    queries = {
+        'state_insights': f"""
+            SELECT STATE, TOTAL_DENTISTS, FEMALE_DENTISTS, FEMALE_PCT, NEW_PRACTICES, GROWTH_PRACTICES,
+                   ESTABLISHED_PRACTICES, INNOVATION_READY_PCT, ZIP_COUNT, CITY_COUNT
+            FROM CLEAN.V_STATE_INSIGHTS WHERE STATE IN ({US_STATES_FILTER})
+        """,
+        'county_density': COUNTY_DENSITY_SQL.format(limit=100),
+        'orgs': ORGS_SQL,
+        'market_opp': f"""
+            SELECT CITY, STATE, MARKET, TOTAL_PROVIDERS, NEW_PRACTICES, NEW_PRACTICE_PCT, FEMALE_PCT, MARKET_TYPE
+            FROM CLEAN.V_MARKET_OPPORTUNITY WHERE STATE IN ({US_STATES_FILTER}) ORDER BY NEW_PRACTICE_PCT DESC LIMIT 200
+        """,
+        # Only the national rollup is charted, so reduce to one row per specialty server-side
+        'specialty_national': f"""
+            SELECT SPECIALTY, SUM(PROVIDER_COUNT) as PROVIDER_COUNT FROM CLEAN.V_SPECIALTY_BY_STATE
+            WHERE STATE IN (SELECT STATE FROM CLEAN.V_STATE_INSIGHTS WHERE STATE IN ({US_STATES_FILTER}) ORDER BY TOTAL_DENTISTS DESC LIMIT 10)
+            GROUP BY SPECIALTY ORDER BY PROVIDER_COUNT DESC
+        """,
+        # Dentist, practice and city totals roll up from state_insights / org_by_state;
+        # only the counts with no other source need their own scans
+        'stats': f"""
             SELECT 
-                (SELECT COUNT(*) FROM CLEAN.V_INDIVIDUAL_DENTISTS WHERE STATE IN ('{us_states_sql}')),
-                (SELECT COUNT(*) FROM CLEAN.V_ORGANIZATIONS WHERE STATE IN ('{us_states_sql}')),
-                (SELECT COUNT(*) FROM CLEAN.V_DECISION_MAKERS WHERE ORG_STATE IN ('{us_states_sql}')),
-                51,
-                (SELECT COUNT(DISTINCT CITY) FROM CLEAN.V_INDIVIDUAL_DENTISTS WHERE STATE IN ('{us_states_sql}')),
+                (SELECT COUNT(*) FROM CLEAN.V_DECISION_MAKERS WHERE ORG_STATE IN ({US_STATES_FILTER})),
                 (SELECT COUNT(DISTINCT COUNTY) FROM CLEAN.V_COUNTY_DENSITY)
-        """)
-        stats = cursor.fetchone()
+        """,
+    }
+    
+    frames = {}
+    for name, sql in queries.items():
+        cached = read_cached_frame(name, sql)
+        if cached is not None:
+            frames[name] = cached
+    pending = {name: sql for name, sql in queries.items() if name not in frames}
+    
+    if pending:
+        conn = get_snowflake_connection()
+        if conn is None:
+            raise Exception("Could not establish Snowflake connection")
         
-    finally:
-        cursor.close()
-        conn.close()
+        # Each query runs on its own cursor so warehouse time overlaps - wall time is
+        # the slowest query rather than the sum (a multi-statement request runs serially)
+        with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+            futures = {name: pool.submit(run_query, conn, sql, FRAME_COLUMNS[name]) for name, sql in pending.items()}
+        for name, future in futures.items():
+            frames[name] = future.result()
+            write_cached_frame(name, pending[name], frames[name])
+    
+    for name, df in frames.items():
+        fill_numeric(df, *NUMERIC_COLUMNS[name])
+    
+    # Split the combined organizations result back into its per-state and top-city frames
+    orgs = frames.pop('orgs')
+    is_state = orgs['GRAIN'] == 'state'
+    frames['org_by_state'] = orgs.loc[is_state, ['STATE', 'ORG_COUNT', 'NEW_ORGS', 'INNOVATION_SCORE']].reset_index(drop=True)
+    frames['organizations'] = orgs.loc[~is_state, ['STATE', 'CITY', 'ORG_COUNT', 'NEW_ORGS', 'INNOVATION_SCORE']].reset_index(drop=True)
+    
+    # Choropleth hover labels - resolved once per load instead of on every rerun, into
+    # map-only frames so the shared frames (Data tab table, CSV export) keep their columns
+    for name, cols in (('state_insights', ['STATE', 'TOTAL_DENTISTS', 'INNOVATION_READY_PCT']),
+                       ('org_by_state', ['STATE', 'ORG_COUNT', 'INNOVATION_SCORE'])):
+        df = frames[name]
+        frames[f'{name}_map'] = df[cols].assign(STATE_NAME=df['STATE'].map(STATE_NAMES).fillna(df['STATE']))
+    
+    # Top-15 display slices, cut once per load; the full frames still back the maps and CSV export
+    frames['state_insights_top15'] = frames['state_insights'].nlargest(15, 'TOTAL_DENTISTS')
+    frames['state_insights_top_innov15'] = frames['state_insights'].nlargest(15, 'INNOVATION_READY_PCT')
+    frames['org_by_state_top15'] = frames['org_by_state'].nlargest(15, 'ORG_COUNT')
+    
+    # Low-cardinality labels as categoricals so filters and groupbys run on int8 codes.
+    # V_COUNTY_DENSITY isn't state-filtered, so its codes infer their own categories
+    frames['county_density']['STATE'] = frames['county_density']['STATE'].astype('category')
+    market_opp = frames['market_opp']
+    market_opp['MARKET_TYPE'] = pd.Categorical(market_opp['MARKET_TYPE'], categories=MARKET_TYPES)
+    # market_opp arrives sorted by NEW_PRACTICE_PCT, so its head is the scatter's top 100
+    frames['market_opp_top100'] = market_opp.head(100).reset_index(drop=True)
+    # Axis labels for the Practices city bar
+    organizations = frames['organizations']
+    organizations['CITY_STATE'] = (organizations['CITY'].astype('string[pyarrow]') + ', '
+                                   + organizations['STATE'].astype('string[pyarrow]')).astype('category')
+    
+    # Small rollup feeding the Growth Markets pie
+    market_type_counts = market_opp['MARKET_TYPE'].value_counts()
+    frames['market_type_counts'] = market_type_counts[market_type_counts > 0]
+    # Top Growth Markets table, filtered and relabelled once per load
+    frames['growth_markets_top25'] = (
+        market_opp[market_opp['MARKET_TYPE'].isin(['High Growth', 'Growing'])]
+        .head(25)[['MARKET', 'TOTAL_PROVIDERS', 'NEW_PRACTICES', 'NEW_PRACTICE_PCT', 'MARKET_TYPE']]
+        .rename(columns={'MARKET': 'Market', 'TOTAL_PROVIDERS': 'Total', 'NEW_PRACTICES': 'New',
+                         'NEW_PRACTICE_PCT': 'Innovation %', 'MARKET_TYPE': 'Type'})
+    )
     
+    # KPI scalars cast to native ints once per frame rather than once per value;
+    # the stats frame's lowercase labels are already the KPI keys
+    stats = frames.pop('stats').iloc[0].astype('int64').to_dict()
+    totals = frames['state_insights'][['TOTAL_DENTISTS', 'CITY_COUNT', 'NEW_PRACTICES', 'GROWTH_PRACTICES',
+                                       'ESTABLISHED_PRACTICES']].sum().astype('int64').to_dict()
     return {
-        'state_insights': state_insights,
-        'county_density': county_density,
-        'city_density': city_density,
-        'organizations': organizations,
-        'org_by_state': org_by_state,
-        'market_opp': market_opp,
-        'specialty': specialty,
+        **frames,
         'stats': {
-            'dentists': int(stats[0]) if stats[0] else 0,
-            'orgs': int(stats[1]) if stats[1] else 0,
-            'decision_makers': int(stats[2]) if stats[2] else 0,
-            'states': int(stats[3]) if stats[3] else 0,
-            'cities': int(stats[4]) if stats[4] else 0,
-            'counties': int(stats[5]) if stats[5] else 0
+            **stats,
+            'dentists': totals['TOTAL_DENTISTS'],
+            'orgs': int(frames['org_by_state']['ORG_COUNT'].sum()),
+            'states': len(US_STATES_ONLY),
+            'cities': totals['CITY_COUNT'],
+            # New / growth / established totals for the practice age pie
+            'practice_ages': (totals['NEW_PRACTICES'], totals['GROWTH_PRACTICES'], totals['ESTABLISHED_PRACTICES'])
         }
     }
 
 
+def encode_csv(df):
+    """CSV-encode a frame straight into a bytes buffer, skipping the intermediate str copy"""
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, encoding='utf-8')
+    return buf.getvalue()
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_county_export():
+    """Fetch the 500-county CSV export - only runs once the Data tab is opened"""
+    sql = COUNTY_DENSITY_SQL.format(limit=500)
+    df = read_cached_frame('county_export', sql)
+    if df is None:
+        conn = get_snowflake_connection()
+        if conn is None:
+            raise Exception("Could not establish Snowflake connection")
+        df = run_query(conn, sql, FRAME_COLUMNS['county_export'])
+        # Same zero-filled, typed counts as the on-screen county frame
+        fill_numeric(df, *NUMERIC_COLUMNS['county_density'])
+        write_cached_frame('county_export', sql, df)
+    return encode_csv(df)
+
+
+# Teal color scale (OpenAI-ish)
+TEAL_SCALE = [[0, '#0d3d38'], [0.5, '#10a37f'], [1, '#6ee7b7']]
+
+
+# Dark theme registered once as a template layered over plotly's default, so each
+# figure picks it up at construction instead of three validated update passes
+DARK_AXIS = dict(gridcolor='rgba(255,255,255,0.06)', zerolinecolor='rgba(255,255,255,0.06)')
+pio.templates['dental_dark'] = go.layout.Template(layout=dict(
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    font=dict(color='rgba(255,255,255,0.8)', size=11),
+    xaxis=DARK_AXIS,
+    yaxis=DARK_AXIS,
+))
+pio.templates.default = 'plotly+dental_dark'
+
+
+# Shared geo layout for the state choropleths. locationmode='USA-states' resolves
+# against plotly.js's built-in topojson in the browser, so no GeoJSON is loaded
+# or embedded server-side; both maps just reuse one layout definition.
+US_GEO = dict(scope='usa', bgcolor='rgba(0,0,0,0)', lakecolor='rgba(0,0,0,0)', landcolor='#1a1a1a', showlakes=False)
+
+
+# Figure builders - memoized on the content hash of their input frames so a
+# rerun with unchanged data reuses the built figure instead of rebuilding it.
+# cache_resource hands back the same Figure object rather than unpickling a copy on
+# every hit; st.plotly_chart only serializes it, never mutates it. That serialization
+# goes through pio.to_json, whose default 'auto' engine uses orjson (requirements.txt)
+# when it is installed.
+# Every chart is built as graph_objects traces straight from column arrays,
+# skipping Plotly Express's per-column trace grouping and hover-template generation.
+# Traces and figures pass _validate=False: the specs here are fixed and known-good,
+# so plotly's per-property validator pass is pure overhead on a cache miss.
+
+BAR_TEXTFONT = dict(color='rgba(255,255,255,0.7)')
+
+
+def teal_bar(df, label_col, value_col, color_col=None, orientation='v', texttemplate='%{text:,}', showscale=False,
+             **layout):
+    """Teal-scaled bar with outside value labels, hover matching the old px.bar output.
+    Keyword arguments become the figure layout, validated once at construction."""
+    color_col = color_col or value_col
+    label_axis, value_axis = ('y', 'x') if orientation == 'h' else ('x', 'y')
+    return go.Figure(data=[go.Bar(
+        **{label_axis: df[label_col].to_numpy(), value_axis: df[value_col].to_numpy()},
+        orientation=orientation,
+        marker=dict(color=df[color_col].to_numpy(), colorscale=TEAL_SCALE, showscale=showscale,
+                    colorbar=dict(title=color_col)),
+        text=df[value_col].to_numpy(), texttemplate=texttemplate, textposition='outside', textfont=BAR_TEXTFONT,
+        hovertemplate=f"{label_col}=%{{{label_axis}}}<br>{value_col}=%{{{value_axis}:,}}<extra></extra>",
+        _validate=False,
+    )], layout=layout, _validate=False)
+
+
+def category_axis(labels=None, **axis):
+    """Category axis layout, optionally pinned to the given label order"""
+    if labels is None:
+        return dict(type='category', **axis)
+    return dict(type='category', categoryorder='array', categoryarray=labels, **axis)
+
+
+def teal_choropleth(df, value_col, detail_col):
+    """State choropleth over US_GEO, hovering the full state name, the value and one detail column"""
+    return go.Figure(data=[go.Choropleth(
+        locations=df['STATE'].to_numpy(), z=df[value_col].to_numpy(), locationmode='USA-states',
+        colorscale=TEAL_SCALE, colorbar=dict(title=value_col),
+        hovertext=df['STATE_NAME'].to_numpy(), customdata=df[detail_col].to_numpy(),
+        hovertemplate=f"<b>%{{hovertext}}</b><br>{value_col}=%{{z:,}}<br>{detail_col}=%{{customdata:.1f}}<extra></extra>",
+        _validate=False,
+    )], layout=dict(geo=US_GEO, margin=dict(l=0, r=0, t=0, b=0)), _validate=False)
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_state_map(state_insights):
+    return teal_choropleth(state_insights, 'TOTAL_DENTISTS', 'INNOVATION_READY_PCT')
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_top_states_bar(top_states):
+    # Frame is already sorted descending; pin the order instead of a client-side 'total ascending' sort
+    return teal_bar(top_states, 'STATE', 'TOTAL_DENTISTS', orientation='h',
+                    showlegend=False, height=450, margin=dict(l=0, r=70, t=0, b=0),
+                    yaxis=category_axis(top_states['STATE'].tolist()[::-1]))
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_county_bar(county_top):
+    county_df = county_top.head(25)
+    return teal_bar(county_df, 'STATE_COUNTY', 'PROVIDER_COUNT', color_col='INNOVATION_SCORE', showscale=True,
+                    height=400, hovermode='closest', margin=dict(l=0, r=0, t=20, b=120),
+                    xaxis=category_axis(county_df['STATE_COUNTY'].tolist(), tickangle=-45))
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_org_map(org_by_state):
+    return teal_choropleth(org_by_state, 'ORG_COUNT', 'INNOVATION_SCORE')
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_top_org_states_bar(top_org):
+    return teal_bar(top_org, 'STATE', 'ORG_COUNT', orientation='h',
+                    showlegend=False, height=450, margin=dict(l=0, r=70, t=0, b=0),
+                    yaxis=category_axis(top_org['STATE'].tolist()[::-1]))
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_org_city_bar(organizations):
+    return teal_bar(organizations, 'CITY_STATE', 'ORG_COUNT',
+                    height=400, hovermode='closest', margin=dict(l=0, r=0, t=20, b=100),
+                    xaxis=category_axis(organizations['CITY_STATE'].tolist(), tickangle=-45))
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_innovation_bar(innov_df):
+    return teal_bar(innov_df, 'STATE', 'INNOVATION_READY_PCT', texttemplate='%{text:.1f}%',
+                    showlegend=False, height=350, xaxis=category_axis())
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_age_pie(counts):
+    return go.Figure(data=[go.Pie(
+        labels=['New (0-5 yrs)', 'Growth (5-10 yrs)', 'Established (10+ yrs)'], values=list(counts), hole=0.5,
+        marker=dict(colors=['#10a37f', '#3b82f6', '#374151']),
+        textinfo='percent+label', textposition='outside', textfont=BAR_TEXTFONT, _validate=False,
+    )], layout=dict(height=350, showlegend=False), _validate=False)
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_specialty_bar(spec_national):
+    return teal_bar(spec_national, 'SPECIALTY', 'PROVIDER_COUNT', orientation='h',
+                    showlegend=False, height=400, margin=dict(l=0, r=70, t=20, b=0),
+                    yaxis=dict(categoryorder='total ascending'))
+
+
+# Growth Markets segment colors, shared by the pie and the scatter
+MARKET_COLORS = {'High Growth': '#10a37f', 'Growing': '#3b82f6', 'Established': '#6366f1',
+                 'Mid-Size': '#8b5cf6', 'Emerging': '#374151'}
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_market_pie(market_counts):
+    return go.Figure(data=[go.Pie(
+        labels=market_counts.index.to_numpy(), values=market_counts.to_numpy(), hole=0.5,
+        marker=dict(colors=[MARKET_COLORS[label] for label in market_counts.index]),
+        textinfo='percent+label', textfont=BAR_TEXTFONT, _validate=False,
+    )], layout=dict(height=320, showlegend=False), _validate=False)
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_market_scatter(market_top):
+    """One WebGL trace per market type, bubbles area-scaled the way px sizes them"""
+    sizeref = 2.0 * market_top['TOTAL_PROVIDERS'].max() / 20 ** 2
+    traces = []
+    for market_type in MARKET_TYPES:
+        segment = market_top[market_top['MARKET_TYPE'] == market_type]
+        if segment.empty:
+            continue
+        traces.append(go.Scattergl(
+            x=segment['TOTAL_PROVIDERS'].to_numpy(), y=segment['NEW_PRACTICE_PCT'].to_numpy(),
+            mode='markers', name=market_type, legendgroup=market_type,
+            marker=dict(color=MARKET_COLORS[market_type], size=segment['TOTAL_PROVIDERS'].to_numpy(),
+                        sizemode='area', sizeref=sizeref),
+            hovertext=segment['MARKET'].to_numpy(),
+            hovertemplate=(f"<b>%{{hovertext}}</b><br><br>MARKET_TYPE={market_type}<br>"
+                           "TOTAL_PROVIDERS=%{x:,}<br>NEW_PRACTICE_PCT=%{y}<extra></extra>"),
+            _validate=False,
+        ))
+    return go.Figure(data=traces, layout=dict(
+        height=320, legend=dict(title=dict(text='MARKET_TYPE'), itemsizing='constant'),
+        xaxis=dict(title=dict(text='TOTAL_PROVIDERS')), yaxis=dict(title=dict(text='NEW_PRACTICE_PCT')),
+    ), _validate=False)
+
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df):
+    """Encode a frame for st.download_button once per distinct frame"""
+    return encode_csv(df)
+
+
+def render_dentists(data):
+    """Tab 1: Dentists"""
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        st.subheader("Dentist Density by State", anchor=False)
+        # Charts carry stable keys so reruns update the mounted plot in place rather than remounting it
+        st.plotly_chart(build_state_map(data['state_insights_map']), use_container_width=True, key="dentists_map")
+    
+    with col2:
+        st.subheader("Top 15 States", anchor=False)
+        st.plotly_chart(build_top_states_bar(data['state_insights_top15']), use_container_width=True, key="dentists_top_states")
+    
+    st.subheader("Top 25 Counties", anchor=False)
+    st.markdown('<div class="insight-box"><strong>Innovation Score</strong> = % of dentists registered in last 5 years. Higher scores indicate markets more receptive to modern solutions.</div>', unsafe_allow_html=True)
+    st.plotly_chart(build_county_bar(data['county_density']), use_container_width=True, key="dentists_top_counties")
+
+
+def render_practices(data):
+    """Tab 2: Practices"""
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        st.subheader("Dental Practices by State", anchor=False)
+        st.plotly_chart(build_org_map(data['org_by_state_map']), use_container_width=True, key="practices_map")
+    
+    with col2:
+        st.subheader("Top 15 States", anchor=False)
+        st.plotly_chart(build_top_org_states_bar(data['org_by_state_top15']), use_container_width=True, key="practices_top_states")
+    
+    st.subheader("Top 20 Cities", anchor=False)
+    st.plotly_chart(build_org_city_bar(data['organizations']), use_container_width=True, key="practices_top_cities")
+
+
+def render_segments(data):
+    """Tab 3: Segments"""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Innovation Score by State", anchor=False)
+        st.markdown('<div class="insight-box"><strong>Innovation Score</strong> = % registered in last 10 years. Higher = more receptive to new solutions.</div>', unsafe_allow_html=True)
+        st.plotly_chart(build_innovation_bar(data['state_insights_top_innov15']), use_container_width=True, key="insights_innovation")
+    
+    with col2:
+        st.subheader("Practice Age Distribution", anchor=False)
+        counts = data['stats']['practice_ages']
+        st.plotly_chart(build_age_pie(counts), use_container_width=True, key="insights_practice_age")
+        total = sum(counts)
+        new_pct = counts[0] / total * 100 if total > 0 else 0
+        st.markdown(f'<div class="insight-box"><strong>{new_pct:.1f}%</strong> registered in last 5 years — early adopter targets.</div>', unsafe_allow_html=True)
+    
+    st.subheader("Specialty Distribution", anchor=False)
+    st.plotly_chart(build_specialty_bar(data['specialty_national']), use_container_width=True, key="insights_specialties")
+
+
+def render_growth_markets(data):
+    """Tab 4: Growth Markets"""
+    st.subheader("High-Growth Market Opportunities", anchor=False)
+    st.markdown('<div class="insight-box"><strong>High Growth</strong> = 50+ providers with >15% new practices in last 5 years.</div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.plotly_chart(build_market_pie(data['market_type_counts']), use_container_width=True, key="markets_pie")
+    
+    with col2:
+        st.plotly_chart(build_market_scatter(data['market_opp_top100']), use_container_width=True, key="markets_scatter")
+    
+    st.subheader("Top Growth Markets", anchor=False)
+    st.dataframe(data['growth_markets_top25'], use_container_width=True, hide_index=True)
+
+
+def render_data(data):
+    """Tab 5: Data"""
+    st.subheader("State-Level Data", anchor=False)
+    st.dataframe(data['state_insights'], use_container_width=True, hide_index=True)
+    st.download_button("Download State Data", to_csv_bytes(data['state_insights']), "dental_state_data.csv", "text/csv")
+    
+    st.subheader("County-Level Data", anchor=False)
+    st.dataframe(data['county_density'], use_container_width=True, hide_index=True)
+    st.download_button("Download County Data", load_county_export(), "dental_county_data.csv", "text/csv")
+
+
+TABS = {
+    "Dentists": render_dentists,
+    "Practices": render_practices,
+    "Segments": render_segments,
+    "Growth Markets": render_growth_markets,
+    "Data": render_data,
+}
+
+
+KPI_CARDS = (('dentists', 'Dentists', '{:,}'), ('orgs', 'Practices', '{:,}'), ('decision_makers', 'Owners', '{:,}'),
+             ('states', 'States', '{}'), ('counties', 'Counties', '{:,}'), ('cities', 'Cities', '{:,}'))
+
+
+@st.cache_data(show_spinner=False)
+def build_kpi_row(stats):
+    """KPI row markup, built once per distinct stats dict rather than on every rerun"""
+    cards = ''.join(f'<div class="kpi-card"><div class="kpi-value">{fmt.format(stats[key])}</div>'
+                    f'<div class="kpi-label">{label}</div></div>' for key, label, fmt in KPI_CARDS)
+    return f'<div class="kpi-row">{cards}</div>'
+
+
+@st.fragment
+def render_tabs(data):
+    """Tab navigation - switching tabs reruns only this fragment, not the header, KPIs or load_data()"""
+    active = st.radio("View", list(TABS), horizontal=True, label_visibility="collapsed", key="active_tab")
+    TABS[active](data)
+
+
 def main():
     if not check_password():
         return
@@ -392,194 +826,12 @@ def main():
         """)
         return
     
-    # No sidebar - hide it completely
-    st.markdown("""<style>[data-testid="stSidebar"] { display: none; }</style>""", unsafe_allow_html=True)
-    
-    # Subtle KPI Row
-    st.markdown(f"""
-    <div style="display: flex; gap: 12px; margin-bottom: 1.5rem;">
-        <div class="kpi-card"><div class="kpi-value">{data['stats']['dentists']:,}</div><div class="kpi-label">Dentists</div></div>
-        <div class="kpi-card"><div class="kpi-value">{data['stats']['orgs']:,}</div><div class="kpi-label">Practices</div></div>
-        <div class="kpi-card"><div class="kpi-value">{data['stats']['decision_makers']:,}</div><div class="kpi-label">Owners</div></div>
-        <div class="kpi-card"><div class="kpi-value">{data['stats']['states']}</div><div class="kpi-label">States</div></div>
-        <div class="kpi-card"><div class="kpi-value">{data['stats']['counties']:,}</div><div class="kpi-label">Counties</div></div>
-        <div class="kpi-card"><div class="kpi-value">{data['stats']['cities']:,}</div><div class="kpi-label">Cities</div></div>
-    </div>
-    """, unsafe_allow_html=True)
+    # Subtle KPI Row - styled by the stylesheet's kpi-* classes, so the markup is only the values
+    st.markdown(build_kpi_row(data['stats']), unsafe_allow_html=True)
     
     st.markdown("---")
     
-    # Clean tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "Dentists", "Practices", "Segments", "Growth Markets", "Data"
-    ])
-    
-    # Teal color scale (OpenAI-ish)
-    teal_scale = [[0, '#0d3d38'], [0.5, '#10a37f'], [1, '#6ee7b7']]
-    
-    # Apply dark theme to a figure
-    def apply_dark_theme(fig, category_order=None):
-        fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='rgba(255,255,255,0.8)', size=11),
-        )
-        fig.update_xaxes(gridcolor='rgba(255,255,255,0.06)', zerolinecolor='rgba(255,255,255,0.06)')
-        fig.update_yaxes(gridcolor='rgba(255,255,255,0.06)', zerolinecolor='rgba(255,255,255,0.06)')
-        if category_order:
-            fig.update_yaxes(categoryorder=category_order)
-        return fig
-    
-    # TAB 1: Dentists
-    with tab1:
-        col1, col2 = st.columns([3, 2])
-        with col1:
-            st.markdown('<div class="section-header">Dentist Density by State</div>', unsafe_allow_html=True)
-            map_df = data['state_insights'].copy()
-            map_df['STATE_NAME'] = map_df['STATE'].map(STATE_NAMES)
-            fig_map = px.choropleth(map_df, locations='STATE', locationmode='USA-states',
-                color='TOTAL_DENTISTS', scope='usa', color_continuous_scale=teal_scale,
-                hover_name='STATE_NAME', hover_data={'TOTAL_DENTISTS': ':,', 'INNOVATION_READY_PCT': ':.1f', 'STATE': False})
-            fig_map.update_layout(geo=dict(bgcolor='rgba(0,0,0,0)', lakecolor='rgba(0,0,0,0)', landcolor='#1a1a1a', showlakes=False), 
-                margin=dict(l=0, r=0, t=0, b=0))
-            apply_dark_theme(fig_map)
-            st.plotly_chart(fig_map, use_container_width=True)
-        
-        with col2:
-            st.markdown('<div class="section-header">Top 15 States</div>', unsafe_allow_html=True)
-            top_states = data['state_insights'].nlargest(15, 'TOTAL_DENTISTS')
-            fig_bar = px.bar(top_states, x='TOTAL_DENTISTS', y='STATE', orientation='h',
-                color='TOTAL_DENTISTS', color_continuous_scale=teal_scale, text='TOTAL_DENTISTS')
-            fig_bar.update_traces(texttemplate='%{text:,}', textposition='outside', textfont=dict(color='rgba(255,255,255,0.7)'))
-            fig_bar.update_layout(showlegend=False, height=450, coloraxis_showscale=False, margin=dict(l=0, r=70, t=0, b=0))
-            apply_dark_theme(fig_bar, 'total ascending')
-            st.plotly_chart(fig_bar, use_container_width=True)
-        
-        st.markdown('<div class="section-header">Top 25 Counties</div>', unsafe_allow_html=True)
-        st.markdown('<div class="insight-box"><strong>Innovation Score</strong> = % of dentists registered in last 5 years. Higher scores indicate markets more receptive to modern solutions.</div>', unsafe_allow_html=True)
-        county_df = data['county_density'].head(25)
-        fig_county = px.bar(county_df, x='STATE_COUNTY', y='PROVIDER_COUNT', color='INNOVATION_SCORE',
-            color_continuous_scale=teal_scale, text='PROVIDER_COUNT')
-        fig_county.update_traces(texttemplate='%{text:,}', textposition='outside', textfont=dict(color='rgba(255,255,255,0.7)'))
-        fig_county.update_layout(xaxis_tickangle=-45, height=400, margin=dict(l=0, r=0, t=20, b=120))
-        apply_dark_theme(fig_county)
-        st.plotly_chart(fig_county, use_container_width=True)
-    
-    # TAB 2: Practices
-    with tab2:
-        col1, col2 = st.columns([3, 2])
-        with col1:
-            st.markdown('<div class="section-header">Dental Practices by State</div>', unsafe_allow_html=True)
-            org_map_df = data['org_by_state'].copy()
-            org_map_df['STATE_NAME'] = org_map_df['STATE'].map(STATE_NAMES)
-            fig_org_map = px.choropleth(org_map_df, locations='STATE', locationmode='USA-states',
-                color='ORG_COUNT', scope='usa', color_continuous_scale=teal_scale, hover_name='STATE_NAME',
-                hover_data={'ORG_COUNT': ':,', 'INNOVATION_SCORE': ':.1f', 'STATE': False})
-            fig_org_map.update_layout(geo=dict(bgcolor='rgba(0,0,0,0)', lakecolor='rgba(0,0,0,0)', landcolor='#1a1a1a', showlakes=False), 
-                margin=dict(l=0, r=0, t=0, b=0))
-            apply_dark_theme(fig_org_map)
-            st.plotly_chart(fig_org_map, use_container_width=True)
-        
-        with col2:
-            st.markdown('<div class="section-header">Top 15 States</div>', unsafe_allow_html=True)
-            top_org = data['org_by_state'].nlargest(15, 'ORG_COUNT')
-            fig_org_bar = px.bar(top_org, x='ORG_COUNT', y='STATE', orientation='h',
-                color='ORG_COUNT', color_continuous_scale=teal_scale, text='ORG_COUNT')
-            fig_org_bar.update_traces(texttemplate='%{text:,}', textposition='outside', textfont=dict(color='rgba(255,255,255,0.7)'))
-            fig_org_bar.update_layout(showlegend=False, height=450, coloraxis_showscale=False, margin=dict(l=0, r=70, t=0, b=0))
-            apply_dark_theme(fig_org_bar, 'total ascending')
-            st.plotly_chart(fig_org_bar, use_container_width=True)
-        
-        st.markdown('<div class="section-header">Top 20 Cities</div>', unsafe_allow_html=True)
-        org_city = data['organizations'].head(20)
-        org_city['CITY_STATE'] = org_city['CITY'] + ', ' + org_city['STATE']
-        fig_org_city = px.bar(org_city, x='CITY_STATE', y='ORG_COUNT', color='ORG_COUNT',
-            color_continuous_scale=teal_scale, text='ORG_COUNT')
-        fig_org_city.update_traces(texttemplate='%{text:,}', textposition='outside', textfont=dict(color='rgba(255,255,255,0.7)'))
-        fig_org_city.update_layout(xaxis_tickangle=-45, height=400, coloraxis_showscale=False, margin=dict(l=0, r=0, t=20, b=100))
-        apply_dark_theme(fig_org_city)
-        st.plotly_chart(fig_org_city, use_container_width=True)
-    
-    # TAB 3: Segments
-    with tab3:
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown('<div class="section-header">Innovation Score by State</div>', unsafe_allow_html=True)
-            st.markdown('<div class="insight-box"><strong>Innovation Score</strong> = % registered in last 10 years. Higher = more receptive to new solutions.</div>', unsafe_allow_html=True)
-            innov_df = data['state_insights'].nlargest(15, 'INNOVATION_READY_PCT')
-            fig_innov = px.bar(innov_df, x='STATE', y='INNOVATION_READY_PCT', color='INNOVATION_READY_PCT',
-                color_continuous_scale=teal_scale, text='INNOVATION_READY_PCT')
-            fig_innov.update_traces(texttemplate='%{text:.1f}%', textposition='outside', textfont=dict(color='rgba(255,255,255,0.7)'))
-            fig_innov.update_layout(showlegend=False, coloraxis_showscale=False, height=350)
-            apply_dark_theme(fig_innov)
-            st.plotly_chart(fig_innov, use_container_width=True)
-        
-        with col2:
-            st.markdown('<div class="section-header">Practice Age Distribution</div>', unsafe_allow_html=True)
-            new_count = data['state_insights']['NEW_PRACTICES'].sum()
-            growth_count = data['state_insights']['GROWTH_PRACTICES'].sum()
-            established_count = data['state_insights']['ESTABLISHED_PRACTICES'].sum()
-            age_data = pd.DataFrame({
-                'Cohort': ['New (0-5 yrs)', 'Growth (5-10 yrs)', 'Established (10+ yrs)'],
-                'Count': [new_count, growth_count, established_count]
-            })
-            fig_age = px.pie(age_data, values='Count', names='Cohort', hole=0.5,
-                color_discrete_map={'New (0-5 yrs)': '#10a37f', 'Growth (5-10 yrs)': '#3b82f6', 'Established (10+ yrs)': '#374151'})
-            fig_age.update_traces(textinfo='percent+label', textposition='outside', textfont=dict(color='rgba(255,255,255,0.7)'))
-            fig_age.update_layout(height=350, showlegend=False)
-            apply_dark_theme(fig_age)
-            st.plotly_chart(fig_age, use_container_width=True)
-            total = new_count + growth_count + established_count
-            new_pct = new_count / total * 100 if total > 0 else 0
-            st.markdown(f'<div class="insight-box"><strong>{new_pct:.1f}%</strong> registered in last 5 years — early adopter targets.</div>', unsafe_allow_html=True)
-        
-        st.markdown('<div class="section-header">Specialty Distribution</div>', unsafe_allow_html=True)
-        spec_national = data['specialty'].groupby('SPECIALTY')['PROVIDER_COUNT'].sum().reset_index().sort_values('PROVIDER_COUNT', ascending=False)
-        fig_spec = px.bar(spec_national, y='SPECIALTY', x='PROVIDER_COUNT', orientation='h', 
-            color='PROVIDER_COUNT', color_continuous_scale=teal_scale, text='PROVIDER_COUNT')
-        fig_spec.update_traces(texttemplate='%{text:,}', textposition='outside', textfont=dict(color='rgba(255,255,255,0.7)'))
-        fig_spec.update_layout(showlegend=False, height=400, coloraxis_showscale=False, margin=dict(l=0, r=70, t=20, b=0))
-        apply_dark_theme(fig_spec, 'total ascending')
-        st.plotly_chart(fig_spec, use_container_width=True)
-    
-    # TAB 4: Growth Markets
-    with tab4:
-        st.markdown('<div class="section-header">High-Growth Market Opportunities</div>', unsafe_allow_html=True)
-        st.markdown('<div class="insight-box"><strong>High Growth</strong> = 50+ providers with >15% new practices in last 5 years.</div>', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([1, 2])
-        with col1:
-            market_counts = data['market_opp']['MARKET_TYPE'].value_counts()
-            fig_pie = px.pie(values=market_counts.values, names=market_counts.index, hole=0.5,
-                color_discrete_map={'High Growth': '#10a37f', 'Growing': '#3b82f6', 'Established': '#6366f1', 'Mid-Size': '#8b5cf6', 'Emerging': '#374151'})
-            fig_pie.update_traces(textinfo='percent+label', textfont=dict(color='rgba(255,255,255,0.7)'))
-            fig_pie.update_layout(height=320, showlegend=False)
-            apply_dark_theme(fig_pie)
-            st.plotly_chart(fig_pie, use_container_width=True)
-        
-        with col2:
-            fig_scatter = px.scatter(data['market_opp'].head(100), x='TOTAL_PROVIDERS', y='NEW_PRACTICE_PCT',
-                color='MARKET_TYPE', size='TOTAL_PROVIDERS', hover_name='MARKET',
-                color_discrete_map={'High Growth': '#10a37f', 'Growing': '#3b82f6', 'Established': '#6366f1', 'Mid-Size': '#8b5cf6', 'Emerging': '#374151'})
-            fig_scatter.update_layout(height=320)
-            apply_dark_theme(fig_scatter)
-            st.plotly_chart(fig_scatter, use_container_width=True)
-        
-        st.markdown('<div class="section-header">Top Growth Markets</div>', unsafe_allow_html=True)
-        growth_markets = data['market_opp'][data['market_opp']['MARKET_TYPE'].isin(['High Growth', 'Growing'])].head(25)
-        st.dataframe(growth_markets[['MARKET', 'TOTAL_PROVIDERS', 'NEW_PRACTICES', 'NEW_PRACTICE_PCT', 'MARKET_TYPE']].rename(
-            columns={'MARKET': 'Market', 'TOTAL_PROVIDERS': 'Total', 'NEW_PRACTICES': 'New', 'NEW_PRACTICE_PCT': 'Innovation %', 'MARKET_TYPE': 'Type'}),
-            use_container_width=True, hide_index=True)
-    
-    # TAB 5: Data
-    with tab5:
-        st.markdown('<div class="section-header">State-Level Data</div>', unsafe_allow_html=True)
-        st.dataframe(data['state_insights'], use_container_width=True, hide_index=True)
-        st.download_button("Download State Data", data['state_insights'].to_csv(index=False), "dental_state_data.csv", "text/csv")
-        
-        st.markdown('<div class="section-header">County-Level Data</div>', unsafe_allow_html=True)
-        st.dataframe(data['county_density'].head(100), use_container_width=True, hide_index=True)
-        st.download_button("Download County Data", data['county_density'].to_csv(index=False), "dental_county_data.csv", "text/csv")
+    render_tabs(data)
     
     st.markdown("---")
     st.markdown("""
@@ -3,12 +3,20 @@ Dental Leads Dashboard - Streamlit
 Run: streamlit run dashboards/dental_overview.py
 """
 
+import hashlib
+import json
 import os
+import shutil
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
 import plotly.express as px
 import plotly.graph_objects as go
 from utils.snowflake_client import SnowflakeClient
@@ -49,7 +57,9 @@ st.markdown("""
         color: #ffffff !important;
     }
     
+    .metric-row { display: flex; gap: 12px; }
     .metric-card {
+        flex: 1;
         background: linear-gradient(135deg, #1e3a5f 0%, #2d5a87 100%);
         padding: 20px;
         border-radius: 10px;
@@ -97,108 +107,319 @@ STATE_NAMES = {
     'DC': 'District of Columbia', 'PR': 'Puerto Rico'
 }
 
+# Hash-set membership for filtering raw STATE values down to known state codes
+KNOWN_STATES = frozenset(STATE_NAMES)
 
-@st.cache_data(ttl=3600)
-def load_data():
-    """Load data from Snowflake with caching"""
+# Dental NUCC taxonomy codes charted as named specialties; anything else is 'Other Specialty'
+TAXONOMY_TO_SPECIALTY = {
+    '1223G0001X': 'General Dentist',
+    '1223P0221X': 'Pediatric',
+    '1223S0112X': 'Oral Surgery',
+    '1223E0200X': 'Endodontics',
+    '1223P0300X': 'Periodontics',
+    '1223D0001X': 'Orthodontics',
+    '1223P0700X': 'Prosthodontics',
+}
+
+
+# On-disk snapshots so a cold start (container restart, cloud idle eviction)
+# reads local parquet instead of re-querying Snowflake
+CACHE_DIR = Path(os.getenv('DASHBOARD_CACHE_DIR', Path(__file__).parent / '.cache'))
+CACHE_TTL_SECONDS = int(os.getenv('DASHBOARD_CACHE_TTL', 60 * 60))
+
+
+def snapshot_key(name, queries):
+    """Snapshot directory for a loader - the digest of its SQL in the name means any
+    edit to the queries misses the old snapshot"""
+    digest = hashlib.sha1('\n'.join(queries.values()).encode('utf-8')).hexdigest()[:12]
+    return f"{name}-{digest}"
+
+
+def read_snapshot(key):
+    """Return a loader's on-disk snapshot if it is still fresh, else None"""
+    snapshot_dir = CACHE_DIR / key
+    manifest_path = snapshot_dir / 'manifest.json'
+    if not manifest_path.exists() or time.time() - manifest_path.stat().st_mtime > CACHE_TTL_SECONDS:
+        return None
+    try:
+        manifest = json.loads(manifest_path.read_text())
+        data = {name: pd.read_parquet(snapshot_dir / f"{name}.parquet", engine='pyarrow') for name in manifest['frames']}
+    except (OSError, json.JSONDecodeError, KeyError, pa.ArrowInvalid):
+        # Missing or unreadable file - treat the snapshot as a miss and re-query
+        return None
+    if 'stats' in manifest:
+        data['stats'] = manifest['stats']
+    return data
+
+
+def replace_file(path, write):
+    """Write a snapshot file to a temp sibling and rename it into place, so a reader
+    (or another session rewriting the same snapshot) never sees it half-written"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-", suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def write_snapshot(key, data):
+    """Snapshot a loader's frames to parquet and its stats to JSON (best effort)"""
+    snapshot_dir = CACHE_DIR / key
+    frames = [name for name, value in data.items() if isinstance(value, pd.DataFrame)]
+    try:
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        for name in frames:
+            replace_file(snapshot_dir / f"{name}.parquet",
+                         lambda tmp_path: data[name].to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False))
+        manifest = {'frames': frames}
+        if 'stats' in data:
+            manifest['stats'] = data['stats']
+        # Manifest goes last - its mtime marks the snapshot as complete
+        replace_file(snapshot_dir / 'manifest.json', lambda tmp_path: Path(tmp_path).write_text(json.dumps(manifest)))
+        # Drop snapshots left behind by earlier versions of the queries
+        for stale in CACHE_DIR.glob(f"{key.rsplit('-', 1)[0]}-*"):
+            if stale != snapshot_dir:
+                shutil.rmtree(stale, ignore_errors=True)
+    except OSError:
+        pass
+
+
+@st.cache_resource(show_spinner=False)
+def get_client():
+    """One SnowflakeClient per process, kept alive between cache misses instead of
+    reconnecting on every load (its lazy conn reopens a closed session)"""
     os.environ['SKIP_SECRET_MANAGER'] = 'true'
-    
-    with SnowflakeClient() as client:
+    return SnowflakeClient(keep_alive=True)
+
+
+def run_queries(client, queries, params=None):
+    """Run independent queries concurrently, one cursor per worker on a shared connection.
+    Each result arrives as an Arrow-backed DataFrame labelled by its SELECT aliases."""
+    _ = client.conn  # connect once up front so workers don't race the lazy connect
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        futures = {name: pool.submit(client.fetch_df, sql, params) for name, sql in queries.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+# Loaders use cache_resource so reruns share one copy of each frame rather than
+# unpickling a fresh one per hit - treat the returned frames as read-only
+@st.cache_resource(ttl=3600)
+def load_state_maps():
+    """Load the all-state rollups behind the choropleths and state filter"""
+    queries = {
         # Individual dentists by state
-        dentists_by_state = pd.DataFrame(
-            client.execute("""
-                SELECT STATE, COUNT(*) as COUNT, 
-                       COUNT(CASE WHEN GENDER = 'M' THEN 1 END) as MALE,
-                       COUNT(CASE WHEN GENDER = 'F' THEN 1 END) as FEMALE
-                FROM CLEAN.V_INDIVIDUAL_DENTISTS 
-                WHERE STATE IS NOT NULL
-                GROUP BY STATE
-                ORDER BY COUNT DESC
-            """),
-            columns=['STATE', 'COUNT', 'MALE', 'FEMALE']
-        )
-        
+        'dentists_by_state': """
+            SELECT STATE, COUNT(*) as COUNT, 
+                   COUNT(CASE WHEN GENDER = 'M' THEN 1 END) as MALE,
+                   COUNT(CASE WHEN GENDER = 'F' THEN 1 END) as FEMALE
+            FROM CLEAN.V_INDIVIDUAL_DENTISTS 
+            WHERE STATE IS NOT NULL
+            GROUP BY STATE
+            ORDER BY COUNT DESC
+        """,
+        # Decision makers by state
+        'dm_by_state': """
+            SELECT ORG_STATE as STATE, COUNT(*) as COUNT
+            FROM CLEAN.V_DECISION_MAKERS
+            WHERE ORG_STATE IS NOT NULL
+            GROUP BY ORG_STATE
+            ORDER BY COUNT DESC
+        """,
+    }
+    snapshot = snapshot_key('overview_maps', queries)
+    cached = read_snapshot(snapshot)
+    if cached is not None:
+        return cached
+    
+    data = run_queries(get_client(), queries)
+    
+    # Choropleth hover labels, resolved once per load; category keeps one copy of each
+    # code and name, so isin() and plotting work on int codes
+    for df in data.values():
+        df['STATE_NAME'] = df['STATE'].map(STATE_NAMES).astype('category')
+        df['STATE'] = df['STATE'].astype('category')
+    write_snapshot(snapshot, data)
+    return data
+
+
+@st.cache_resource(ttl=3600)
+def load_data(selected_state='All States'):
+    """Load KPI and breakdown data from Snowflake, scoped to one state when selected"""
+    # Push the sidebar filter into the warehouse rather than loading every state
+    state = None if selected_state == 'All States' else selected_state
+    params = {'state': state} if state else None
+    state_filter = "AND STATE = %(state)s" if state else ""
+    org_state_filter = "AND ORG_STATE = %(state)s" if state else ""
+    
+    queries = {
         # Practice age cohorts
-        age_cohorts = pd.DataFrame(
-            client.execute("""
-                SELECT PRACTICE_AGE_COHORT, COUNT(*) as COUNT
-                FROM CLEAN.V_INDIVIDUAL_DENTISTS
-                WHERE PRACTICE_AGE_COHORT IS NOT NULL
-                GROUP BY PRACTICE_AGE_COHORT
-                ORDER BY PRACTICE_AGE_COHORT
-            """),
-            columns=['COHORT', 'COUNT']
-        )
-        
+        'age_cohorts': f"""
+            SELECT PRACTICE_AGE_COHORT as COHORT, COUNT(*) as COUNT
+            FROM CLEAN.V_INDIVIDUAL_DENTISTS
+            WHERE PRACTICE_AGE_COHORT IS NOT NULL {state_filter}
+            GROUP BY PRACTICE_AGE_COHORT
+            ORDER BY PRACTICE_AGE_COHORT
+        """,
         # Gender breakdown
-        gender = pd.DataFrame(
-            client.execute("""
-                SELECT GENDER, COUNT(*) as COUNT
-                FROM CLEAN.V_INDIVIDUAL_DENTISTS
-                WHERE GENDER IS NOT NULL
-                GROUP BY GENDER
-            """),
-            columns=['GENDER', 'COUNT']
-        )
-        
-        # Summary stats
-        stats = client.execute("""
+        'gender': f"""
+            SELECT GENDER, COUNT(*) as COUNT
+            FROM CLEAN.V_INDIVIDUAL_DENTISTS
+            WHERE GENDER IS NOT NULL {state_filter}
+            GROUP BY GENDER
+        """,
+        # Summary stats - one scan per source view; the dentist total is the sum
+        # of the taxonomy breakdown below, which already covers every dentist
+        'stats': f"""
             SELECT 
-                (SELECT COUNT(*) FROM CLEAN.V_INDIVIDUAL_DENTISTS) as dentists,
-                (SELECT COUNT(*) FROM CLEAN.V_ORGANIZATIONS) as orgs,
-                (SELECT COUNT(*) FROM CLEAN.V_DECISION_MAKERS) as decision_makers,
-                (SELECT COUNT(*) FROM CLEAN.V_AUTH_OFFICIALS) as auth_officials,
-                (SELECT COUNT(*) FROM CLEAN.V_AUTH_OFFICIALS WHERE ENRICHED_EMAIL IS NOT NULL) as enriched
-        """)[0]
-        
-        # Top specialties (from taxonomy)
-        specialties = pd.DataFrame(
-            client.execute("""
-                SELECT 
-                    CASE 
-                        WHEN TAXONOMY_CODE = '1223G0001X' THEN 'General Dentist'
-                        WHEN TAXONOMY_CODE = '1223P0221X' THEN 'Pediatric'
-                        WHEN TAXONOMY_CODE = '1223S0112X' THEN 'Oral Surgery'
-                        WHEN TAXONOMY_CODE = '1223E0200X' THEN 'Endodontics'
-                        WHEN TAXONOMY_CODE = '1223P0300X' THEN 'Periodontics'
-                        WHEN TAXONOMY_CODE = '1223D0001X' THEN 'Orthodontics'
-                        WHEN TAXONOMY_CODE = '1223P0700X' THEN 'Prosthodontics'
-                        ELSE 'Other Specialty'
-                    END as SPECIALTY,
-                    COUNT(*) as COUNT
-                FROM CLEAN.V_INDIVIDUAL_DENTISTS
-                GROUP BY 1
-                ORDER BY COUNT DESC
-            """),
-            columns=['SPECIALTY', 'COUNT']
-        )
-        
-        # Decision makers by state
-        dm_by_state = pd.DataFrame(
-            client.execute("""
-                SELECT ORG_STATE as STATE, COUNT(*) as COUNT
-                FROM CLEAN.V_DECISION_MAKERS
-                WHERE ORG_STATE IS NOT NULL
-                GROUP BY ORG_STATE
-                ORDER BY COUNT DESC
-            """),
-            columns=['STATE', 'COUNT']
-        )
-        
-    return {
-        'dentists_by_state': dentists_by_state,
-        'age_cohorts': age_cohorts,
-        'gender': gender,
-        'stats': {
-            'dentists': stats[0],
-            'orgs': stats[1],
-            'decision_makers': stats[2],
-            'auth_officials': stats[3],
-            'enriched': stats[4]
-        },
+                (SELECT COUNT(*) FROM CLEAN.V_ORGANIZATIONS WHERE 1=1 {state_filter}) as orgs,
+                (SELECT COUNT(*) FROM CLEAN.V_DECISION_MAKERS WHERE 1=1 {org_state_filter}) as decision_makers,
+                ao.auth_officials,
+                ao.enriched
+            FROM (
+                SELECT COUNT(*) as auth_officials, COUNT(ENRICHED_EMAIL) as enriched
+                FROM CLEAN.V_AUTH_OFFICIALS WHERE 1=1 {state_filter}
+            ) ao
+        """,
+        # Dentists per taxonomy code - grouping on the raw code keeps the scan free of
+        # per-row CASE evaluation; codes are labelled after the small result lands
+        'taxonomies': f"""
+            SELECT TAXONOMY_CODE, COUNT(*) as COUNT
+            FROM CLEAN.V_INDIVIDUAL_DENTISTS
+            WHERE 1=1 {state_filter}
+            GROUP BY TAXONOMY_CODE
+        """,
+    }
+    # The state is a bind parameter rather than part of the SQL, so it goes in the name too
+    snapshot = snapshot_key(f"overview_{selected_state.replace(' ', '_')}", queries)
+    cached = read_snapshot(snapshot)
+    if cached is not None:
+        return cached
+    
+    frames = run_queries(get_client(), queries, params)
+    
+    taxonomies = frames['taxonomies']
+    specialties = (
+        taxonomies.assign(SPECIALTY=taxonomies['TAXONOMY_CODE'].map(TAXONOMY_TO_SPECIALTY).fillna('Other Specialty'))
+        .groupby('SPECIALTY', as_index=False)['COUNT'].sum()
+        .sort_values('COUNT', ascending=False, ignore_index=True)
+    )
+    # Chart labels are a handful of distinct strings - store them as categoricals
+    specialties['SPECIALTY'] = specialties['SPECIALTY'].astype('category')
+    for name, label in (('age_cohorts', 'COHORT'), ('gender', 'GENDER')):
+        frames[name][label] = frames[name][label].astype('category')
+    # Unquoted aliases come back upper-cased; KPI keys are the lower-case names, cast
+    # to native ints so the snapshot manifest can serialize them
+    stats = {name.lower(): int(value) for name, value in frames['stats'].iloc[0].items()}
+    data = {
+        'age_cohorts': frames['age_cohorts'],
+        'gender': frames['gender'],
+        'stats': {'dentists': int(specialties['COUNT'].sum()), **stats},
         'specialties': specialties,
-        'dm_by_state': dm_by_state
     }
+    write_snapshot(snapshot, data)
+    return data
+
+
+# Shared geo layout for both choropleths. locationmode='USA-states' resolves against
+# plotly.js's bundled state outlines in the browser, so no GeoJSON is fetched or embedded.
+US_GEO = dict(scope='usa', bgcolor='rgba(0,0,0,0)')
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_state_map(state_counts, color_scale, label):
+    """Build a state choropleth once per distinct input - the state filter reruns never change it"""
+    fig = px.choropleth(
+        state_counts,
+        locations='STATE',
+        locationmode='USA-states',
+        color='COUNT',
+        color_continuous_scale=color_scale,
+        hover_name='STATE_NAME',
+        hover_data={'COUNT': ':,', 'STATE': False},
+        labels={'COUNT': label}
+    )
+    fig.update_layout(
+        geo=US_GEO,
+        margin=dict(l=0, r=0, t=0, b=0),
+        coloraxis_colorbar=dict(title="Count")
+    )
+    return fig
+
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_top_states_bar(top_states):
+    fig = px.bar(
+        top_states,
+        x='COUNT',
+        y='STATE',
+        orientation='h',
+        color='COUNT',
+        color_continuous_scale='Blues',
+        text='COUNT'
+    )
+    fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+    fig.update_layout(
+        yaxis={'categoryorder': 'total ascending'},
+        showlegend=False,
+        coloraxis_showscale=False,
+        margin=dict(l=0, r=50, t=0, b=0),
+        height=400
+    )
+    return fig
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_gender_pie(gender):
+    fig = px.pie(
+        gender,
+        values='COUNT',
+        names='GENDER',
+        color='GENDER',
+        color_discrete_map={'M': '#3498db', 'F': '#e74c3c'},
+        hole=0.4
+    )
+    fig.update_traces(textinfo='percent+label')
+    fig.update_layout(margin=dict(l=0, r=0, t=0, b=0))
+    return fig
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_specialty_pie(specialties):
+    fig = px.pie(
+        specialties,
+        values='COUNT',
+        names='SPECIALTY',
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+    fig.update_traces(textinfo='percent+label', textposition='inside')
+    fig.update_layout(margin=dict(l=0, r=0, t=0, b=0), showlegend=False)
+    return fig
+
+
+@st.cache_resource(show_spinner=False, ttl=3600)
+def build_age_bar(age_cohorts):
+    fig = px.bar(
+        age_cohorts,
+        x='COHORT',
+        y='COUNT',
+        color='COUNT',
+        color_continuous_scale='Greens',
+        text='COUNT'
+    )
+    fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+    fig.update_layout(
+        showlegend=False,
+        coloraxis_showscale=False,
+        xaxis_title="Years Since NPI Registration",
+        yaxis_title="Count",
+        margin=dict(l=0, r=0, t=0, b=0)
+    )
+    return fig
 
 
 def main():
@@ -208,29 +429,35 @@ def main():
     
     # Load data
     with st.spinner("Loading data from Snowflake..."):
-        data = load_data()
+        maps = load_state_maps()
     
     # Sidebar filters
     st.sidebar.header("🔍 Filters")
     
-    all_states = ['All States'] + data['dentists_by_state']['STATE'].tolist()
+    states = maps['dentists_by_state']['STATE']
+    all_states = ['All States'] + sorted(states[states.isin(KNOWN_STATES)])
     selected_state = st.sidebar.selectbox("State", all_states)
     
+    # Choropleths always show every state; everything else follows the filter
+    with st.spinner("Loading data from Snowflake..."):
+        data = {**maps, **load_data(selected_state)}
+    
     # KPI Cards
     st.markdown("---")
-    col1, col2, col3, col4, col5 = st.columns(5)
-    
-    with col1:
-        st.metric("👨‍⚕️ Individual Dentists", f"{data['stats']['dentists']:,}")
-    with col2:
-        st.metric("🏢 Organizations", f"{data['stats']['orgs']:,}")
-    with col3:
-        st.metric("🎯 Decision Makers", f"{data['stats']['decision_makers']:,}")
-    with col4:
-        st.metric("📋 Auth Officials", f"{data['stats']['auth_officials']:,}")
-    with col5:
-        enrichment_rate = (data['stats']['enriched'] / data['stats']['auth_officials'] * 100) if data['stats']['auth_officials'] > 0 else 0
-        st.metric("✅ Enriched", f"{data['stats']['enriched']:,}", f"{enrichment_rate:.1f}%")
+    enrichment_rate = (data['stats']['enriched'] / data['stats']['auth_officials'] * 100) if data['stats']['auth_officials'] > 0 else 0
+    kpis = [
+        ("👨‍⚕️ Individual Dentists", f"{data['stats']['dentists']:,}"),
+        ("🏢 Organizations", f"{data['stats']['orgs']:,}"),
+        ("🎯 Decision Makers", f"{data['stats']['decision_makers']:,}"),
+        ("📋 Auth Officials", f"{data['stats']['auth_officials']:,}"),
+        ("✅ Enriched", f"{data['stats']['enriched']:,} ({enrichment_rate:.1f}%)"),
+    ]
+    # One flex row in a single st.markdown instead of five column/metric elements
+    cards = "".join(
+        f'<div class="metric-card"><div class="metric-value">{value}</div><div class="metric-label">{label}</div></div>'
+        for label, value in kpis
+    )
+    st.markdown(f'<div class="metric-row">{cards}</div>', unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -240,100 +467,32 @@ def main():
     with col1:
         st.subheader("📍 Dentists by State")
         
-        # Prepare data for choropleth
-        map_df = data['dentists_by_state'].copy()
-        map_df['STATE_NAME'] = map_df['STATE'].map(STATE_NAMES)
-        
-        fig_map = px.choropleth(
-            map_df,
-            locations='STATE',
-            locationmode='USA-states',
-            color='COUNT',
-            scope='usa',
-            color_continuous_scale='Blues',
-            hover_name='STATE_NAME',
-            hover_data={'COUNT': ':,', 'STATE': False},
-            labels={'COUNT': 'Dentists'}
-        )
-        fig_map.update_layout(
-            geo=dict(bgcolor='rgba(0,0,0,0)'),
-            margin=dict(l=0, r=0, t=0, b=0),
-            coloraxis_colorbar=dict(title="Count")
-        )
-        st.plotly_chart(fig_map, use_container_width=True)
+        fig_map = build_state_map(data['dentists_by_state'], 'Blues', 'Dentists')
+        # Stable chart keys let a state filter change update each plot in place instead of remounting it
+        st.plotly_chart(fig_map, use_container_width=True, key="dentists_map")
     
     with col2:
         st.subheader("🏆 Top 10 States")
-        top_states = data['dentists_by_state'].head(10)
-        
-        fig_bar = px.bar(
-            top_states,
-            x='COUNT',
-            y='STATE',
-            orientation='h',
-            color='COUNT',
-            color_continuous_scale='Blues',
-            text='COUNT'
-        )
-        fig_bar.update_traces(texttemplate='%{text:,}', textposition='outside')
-        fig_bar.update_layout(
-            yaxis={'categoryorder': 'total ascending'},
-            showlegend=False,
-            coloraxis_showscale=False,
-            margin=dict(l=0, r=50, t=0, b=0),
-            height=400
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
+        fig_bar = build_top_states_bar(data['dentists_by_state'].head(10))
+        st.plotly_chart(fig_bar, use_container_width=True, key="top_states")
     
     # Row 2: Gender, Specialties, Practice Age
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.subheader("👥 Gender Distribution")
-        fig_gender = px.pie(
-            data['gender'],
-            values='COUNT',
-            names='GENDER',
-            color='GENDER',
-            color_discrete_map={'M': '#3498db', 'F': '#e74c3c'},
-            hole=0.4
-        )
-        fig_gender.update_traces(textinfo='percent+label')
-        fig_gender.update_layout(margin=dict(l=0, r=0, t=0, b=0))
-        st.plotly_chart(fig_gender, use_container_width=True)
+        fig_gender = build_gender_pie(data['gender'])
+        st.plotly_chart(fig_gender, use_container_width=True, key="gender")
     
     with col2:
         st.subheader("🎓 Specialties")
-        fig_spec = px.pie(
-            data['specialties'],
-            values='COUNT',
-            names='SPECIALTY',
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Set2
-        )
-        fig_spec.update_traces(textinfo='percent+label', textposition='inside')
-        fig_spec.update_layout(margin=dict(l=0, r=0, t=0, b=0), showlegend=False)
-        st.plotly_chart(fig_spec, use_container_width=True)
+        fig_spec = build_specialty_pie(data['specialties'])
+        st.plotly_chart(fig_spec, use_container_width=True, key="specialties")
     
     with col3:
         st.subheader("📅 Practice Age (NPI)")
-        fig_age = px.bar(
-            data['age_cohorts'],
-            x='COHORT',
-            y='COUNT',
-            color='COUNT',
-            color_continuous_scale='Greens',
-            text='COUNT'
-        )
-        fig_age.update_traces(texttemplate='%{text:,}', textposition='outside')
-        fig_age.update_layout(
-            showlegend=False,
-            coloraxis_showscale=False,
-            xaxis_title="Years Since NPI Registration",
-            yaxis_title="Count",
-            margin=dict(l=0, r=0, t=0, b=0)
-        )
-        st.plotly_chart(fig_age, use_container_width=True)
+        fig_age = build_age_bar(data['age_cohorts'])
+        st.plotly_chart(fig_age, use_container_width=True, key="practice_age")
     
     # Row 3: Decision Makers Map
     st.markdown("---")
@@ -342,26 +501,8 @@ def main():
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        dm_df = data['dm_by_state'].copy()
-        dm_df['STATE_NAME'] = dm_df['STATE'].map(STATE_NAMES)
-        
-        fig_dm_map = px.choropleth(
-            dm_df,
-            locations='STATE',
-            locationmode='USA-states',
-            color='COUNT',
-            scope='usa',
-            color_continuous_scale='Oranges',
-            hover_name='STATE_NAME',
-            hover_data={'COUNT': ':,', 'STATE': False},
-            labels={'COUNT': 'Decision Makers'}
-        )
-        fig_dm_map.update_layout(
-            geo=dict(bgcolor='rgba(0,0,0,0)'),
-            margin=dict(l=0, r=0, t=0, b=0),
-            coloraxis_colorbar=dict(title="Count")
-        )
-        st.plotly_chart(fig_dm_map, use_container_width=True)
+        fig_dm_map = build_state_map(data['dm_by_state'], 'Oranges', 'Decision Makers')
+        st.plotly_chart(fig_dm_map, use_container_width=True, key="decision_makers_map")
     
     with col2:
         st.markdown("""
@@ -18,6 +18,9 @@ Usage:
     # Enrich with rate limiting and resume
     python apollo_enrich.py --input exports/tx_new_dentists_6mo.csv --batch-size 50 --delay 1.0
 
+    # Overlap more lookups in flight (still spaced by --delay)
+    python apollo_enrich.py --input exports/tx_new_dentists_6mo.csv --concurrency 8 --delay 0.25
+
     # Dry run (show what would be sent, no API calls)
     python apollo_enrich.py --input exports/tx_new_dentists_6mo.csv --dry-run --limit 5
 
@@ -35,24 +38,58 @@ Budget Management:
     Tracks usage in ~/.apollo_usage.json
     Use --budget to set custom limit for this run
     Use --show-usage to see current cycle usage
+
+Response Cache:
+    Apollo responses are cached in ~/.apollo_cache.sqlite for 7 days, keyed on
+    the lookup inputs, so reruns and duplicate rows cost no extra credits
+    Use --cache-ttl-days to change the window, --no-cache to always call Apollo
 """
 
 import argparse
+import copy
 import csv
+import hashlib
 import json
 import os
+import sqlite3
 import sys
+import threading
 import time
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
+from dataclasses import dataclass, fields
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Optional, Dict, List
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 APOLLO_API_URL = "https://api.apollo.io/v1/people/match"
 USAGE_FILE = Path.home() / ".apollo_usage.json"
 DEFAULT_MONTHLY_BUDGET = 2500
+CACHE_FILE = Path.home() / ".apollo_cache.sqlite"
+DEFAULT_CACHE_TTL_DAYS = 7
+
+
+def make_session() -> requests.Session:
+    """HTTP session that keeps Apollo connections alive across calls and backs off on 429/5xx."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"POST"}),  # people/match is a POST
+        raise_on_status=False,  # hand the final response back so enrich_person reports it
+    )
+    session = requests.Session()
+    # pool_maxsize covers the enrich_csv worker pool, so threads don't open throwaway connections
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry))
+    return session
+
+
+SESSION = make_session()
 
 
 # =============================================================================
@@ -64,11 +101,19 @@ def get_billing_cycle_key() -> str:
     return datetime.now().strftime("%Y-%m")
 
 
+# Parsed usage file, reused until the file's mtime changes. Callers only ever see
+# copies, so editing a loaded dict can't get the memo ahead of what's on disk.
+_usage_cache = {"mtime": None, "data": None}
+
+
 def load_usage() -> Dict:
-    """Load usage data from file."""
+    """Load usage data from file (re-parsed only when the file has changed)."""
     if USAGE_FILE.exists():
-        with open(USAGE_FILE, 'r') as f:
-            return json.load(f)
+        mtime = USAGE_FILE.stat().st_mtime_ns
+        if mtime != _usage_cache["mtime"]:
+            with open(USAGE_FILE, 'r') as f:
+                _usage_cache.update(mtime=mtime, data=json.load(f))
+        return copy.deepcopy(_usage_cache["data"])
     return {"cycles": {}, "monthly_budget": DEFAULT_MONTHLY_BUDGET}
 
 
@@ -76,11 +121,13 @@ def save_usage(usage: Dict):
     """Save usage data to file."""
     with open(USAGE_FILE, 'w') as f:
         json.dump(usage, f, indent=2)
+    # Memo is only refreshed once the write has succeeded
+    _usage_cache.update(mtime=USAGE_FILE.stat().st_mtime_ns, data=copy.deepcopy(usage))
 
 
-def get_cycle_usage() -> int:
+def get_cycle_usage(usage: Optional[Dict] = None) -> int:
     """Get credits used in current billing cycle."""
-    usage = load_usage()
+    usage = usage or load_usage()
     cycle = get_billing_cycle_key()
     return usage.get("cycles", {}).get(cycle, {}).get("credits_used", 0)
 
@@ -89,7 +136,7 @@ def get_remaining_budget() -> int:
     """Get remaining credits for current billing cycle."""
     usage = load_usage()
     budget = usage.get("monthly_budget", DEFAULT_MONTHLY_BUDGET)
-    used = get_cycle_usage()
+    used = get_cycle_usage(usage)
     return max(0, budget - used)
 
 
@@ -139,6 +186,77 @@ def show_usage():
     print()
 
 
+class RateLimiter:
+    """Space request start times at least `interval` seconds apart across worker threads."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self):
+        """Block until this caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+class ResponseCache:
+    """SQLite-backed cache of Apollo match responses, keyed on the lookup inputs."""
+
+    def __init__(self, path: Path = CACHE_FILE, ttl_days: float = DEFAULT_CACHE_TTL_DAYS):
+        self.ttl_seconds = ttl_days * 24 * 60 * 60
+        # One connection shared by the worker threads, serialized by the lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, response TEXT, fetched_at INTEGER)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        first_name: str,
+        last_name: str,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        organization_name: Optional[str] = None,
+    ) -> str:
+        """Case-insensitive digest of the fields Apollo matches on."""
+        raw = "|".join(value or '' for value in (first_name, last_name, city, state, organization_name))
+        return hashlib.sha1(raw.lower().encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached response if it is younger than the TTL."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, fetched_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, response: Dict):
+        """Store a response (callers only cache answers, never transport errors)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, response, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(response), int(time.time())),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
 @dataclass
 class EnrichmentResult:
     """Result from Apollo enrichment."""
@@ -174,6 +292,13 @@ class EnrichmentResult:
     api_error: Optional[str] = None
 
 
+# Output CSV column order - the EnrichmentResult fields, resolved once
+_RESULT_FIELDS = tuple(f.name for f in fields(EnrichmentResult))
+
+# Input CSV columns read by enrich_csv
+_INPUT_COLUMNS = ('LIC_ID', 'LIC_NBR', 'FIRST_NME', 'LAST_NME', 'CITY', 'STATE')
+
+
 def enrich_person(
     first_name: str,
     last_name: str,
@@ -217,7 +342,7 @@ def enrich_person(
         payload["organization_name"] = organization_name
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             APOLLO_API_URL,
             headers={"Content-Type": "application/json"},
             json=payload,
@@ -306,6 +431,9 @@ def enrich_csv(
     max_credits: Optional[int] = None,
     dry_run: bool = False,
     resume: bool = True,
+    concurrency: int = 4,
+    use_cache: bool = True,
+    cache_ttl_days: float = DEFAULT_CACHE_TTL_DAYS,
 ) -> Dict:
     """
     Enrich a CSV file with Apollo data.
@@ -314,11 +442,14 @@ def enrich_csv(
         input_file: Path to input CSV
         output_file: Path to output CSV
         batch_size: Records per batch (for progress reporting)
-        delay: Seconds between API calls
+        delay: Minimum seconds between API call starts
         limit: Max records to process
         max_credits: Stop after this many successful matches (credits used)
         dry_run: If True, just show what would be sent
         resume: If True, skip already-processed records
+        concurrency: Max API calls in flight at once
+        use_cache: If True, reuse cached Apollo responses instead of re-calling
+        cache_ttl_days: Max age of a reusable cached response
 
     Returns:
         Dict with statistics
@@ -331,42 +462,71 @@ def enrich_csv(
 
     # Load existing results for resume
     processed_ids = set()
-    existing_results = []
     if resume and output_path.exists():
         with open(output_path, 'r') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                existing_results.append(row)
                 processed_ids.add(row.get('license_id', ''))
         print(f"Resuming: {len(processed_ids)} records already processed")
 
-    # Read input
-    with open(input_path, 'r') as f:
-        reader = csv.DictReader(f)
-        input_rows = list(reader)
-
-    print(f"Input file: {len(input_rows)} records")
-
-    # Filter to unprocessed
-    to_process = [
-        row for row in input_rows
-        if row.get('LIC_ID', '') not in processed_ids
-    ]
-
-    if limit:
-        to_process = to_process[:limit]
+    # Rows are read positionally - resolve each input column's index from the header once.
+    # Only LIC_ID is required; absent columns point one past the header at a '' pad slot.
+    with open(input_path, 'r', newline='') as f:
+        header = next(csv.reader(f), [])
+    if 'LIC_ID' not in header:
+        raise ValueError("Input file is missing the LIC_ID column")
+    width = len(header)
+    pad_slot = any(name not in header for name in _INPUT_COLUMNS)
+    lic_id, lic_nbr, first_nme, last_nme, city, state = (
+        header.index(name) if name in header else width for name in _INPUT_COLUMNS
+    )
 
-    print(f"To process: {len(to_process)} records")
+    def iter_input_rows():
+        """Yield input rows fitted to the header width, skipping blank lines."""
+        with open(input_path, 'r', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if not row:
+                    continue
+                # Ragged lines are padded with '' (or trimmed) so indexing can't fail
+                if len(row) != width:
+                    row = row[:width] + [''] * (width - len(row))
+                if pad_slot:
+                    row.append('')
+                yield row
+
+    # Stream the input - rows are read as they're enriched, never held all at once.
+    # A first pass only counts, so the totals below cost no memory either.
+    input_count = 0
+    pending_count = 0
+    for row in iter_input_rows():
+        input_count += 1
+        if row[lic_id] not in processed_ids:
+            pending_count += 1
+
+    print(f"Input file: {input_count} records")
+
+    def iter_to_process():
+        """Yield unprocessed input rows, up to limit."""
+        with closing(iter_input_rows()) as input_rows:
+            rows = (row for row in input_rows if row[lic_id] not in processed_ids)
+            yield from islice(rows, limit) if limit else rows
+
+    to_process_count = min(pending_count, limit) if limit else pending_count
+
+    print(f"To process: {to_process_count} records")
 
     if dry_run:
         print("\n=== DRY RUN - Sample payloads ===\n")
-        for i, row in enumerate(to_process[:5]):
-            print(f"Record {i+1}:")
-            print(f"  Name: {row.get('FIRST_NME', '')} {row.get('LAST_NME', '')}")
-            print(f"  City: {row.get('CITY', '')}, State: {row.get('STATE', '')}")
-            print(f"  License: {row.get('LIC_NBR', '')} ({row.get('LIC_ID', '')})")
-            print()
-        return {"dry_run": True, "would_process": len(to_process)}
+        with closing(iter_to_process()) as sample:
+            for i, row in enumerate(islice(sample, 5)):
+                print(f"Record {i+1}:")
+                print(f"  Name: {row[first_nme]} {row[last_nme]}")
+                print(f"  City: {row[city]}, State: {row[state]}")
+                print(f"  License: {row[lic_nbr]} ({row[lic_id]})")
+                print()
+        return {"dry_run": True, "would_process": to_process_count}
 
     # Check API key
     api_key = os.environ.get('APOLLO_API_KEY')
@@ -392,93 +552,115 @@ def enrich_csv(
         print(f"\n[WARN] Low budget: only {remaining_budget} credits remaining")
 
     # Process records
-    results = existing_results.copy()
     stats = {
         "processed": 0,
         "matched": 0,
+        "credits_used": 0,
+        "cache_hits": 0,
         "emails_found": 0,
         "phones_found": 0,
         "errors": 0,
     }
 
-    output_fields = [
-        'license_id', 'license_number', 'first_name', 'last_name',
-        'input_city', 'input_state', 'apollo_id', 'email', 'email_status',
-        'phone', 'mobile_phone', 'linkedin_url', 'company_name',
-        'company_domain', 'title', 'apollo_city', 'apollo_state',
-        'apollo_country', 'match_score', 'enriched_at', 'api_error'
-    ]
+    limiter = RateLimiter(delay)
 
-    print(f"\nStarting enrichment (delay: {delay}s between calls)...")
-    start_time = datetime.now()
-
-    for i, row in enumerate(to_process):
-        # Check credit limit before making API call
-        if stats["matched"] >= effective_limit:
-            print(f"\n[STOP] Credit limit reached: {stats['matched']} credits used")
-            break
+    def enrich_row(row: List[str]):
+        """Enrich one input row; returns (result, served_from_cache)."""
         # Map input fields
         input_data = {
-            'license_id': row.get('LIC_ID', ''),
-            'license_number': row.get('LIC_NBR', ''),
-            'first_name': row.get('FIRST_NME', ''),
-            'last_name': row.get('LAST_NME', ''),
-            'city': row.get('CITY', ''),
-            'state': row.get('STATE', ''),
+            'license_id': row[lic_id],
+            'license_number': row[lic_nbr],
+            'first_name': row[first_nme],
+            'last_name': row[last_nme],
+            'city': row[city],
+            'state': row[state],
+        }
+
+        lookup = {
+            'first_name': input_data['first_name'],
+            'last_name': input_data['last_name'],
+            'city': input_data['city'],
+            'state': input_data['state'],
         }
 
+        # Cached responses cost no request and no credit
+        cache_key = ResponseCache.make_key(**lookup) if cache else None
+        response = cache.get(cache_key) if cache else None
+        if response is not None:
+            return parse_apollo_response(response, input_data), True
+
         # Call Apollo API
-        response = enrich_person(
-            first_name=input_data['first_name'],
-            last_name=input_data['last_name'],
-            city=input_data['city'],
-            state=input_data['state'],
-            api_key=api_key,
-        )
+        limiter.wait()
+        response = enrich_person(**lookup, api_key=api_key)
+        if cache and "error" not in response:
+            cache.put(cache_key, response)
 
         # Parse response
-        result = parse_apollo_response(response, input_data)
-        results.append(asdict(result))
-
-        # Update stats
-        stats["processed"] += 1
-        if result.apollo_id:
-            stats["matched"] += 1
-        if result.email:
-            stats["emails_found"] += 1
-        if result.phone or result.mobile_phone:
-            stats["phones_found"] += 1
-        if result.api_error:
-            stats["errors"] += 1
-
-        # Progress reporting
-        if (i + 1) % batch_size == 0 or (i + 1) == len(to_process):
+        return parse_apollo_response(response, input_data), False
+
+    print(f"\nStarting enrichment ({concurrency} workers, {delay}s between calls)...")
+    start_time = datetime.now()
+
+    # Resumed runs append new rows to the existing output; fresh runs start it over.
+    # Each window's rows are appended once, so checkpointing stays linear in N.
+    append = resume and output_path.exists() and output_path.stat().st_size > 0
+    # Created right at the with and listed first, so the SQLite handle is closed on any exit -
+    # including Ctrl-C or an API exception - and only after the workers have stopped
+    cache = ResponseCache(ttl_days=cache_ttl_days) if use_cache else None
+    with closing(cache) if cache else nullcontext(), \
+            open(output_path, 'a' if append else 'w', newline='') as out_file, \
+            ThreadPoolExecutor(max_workers=concurrency) as pool, \
+            closing(iter_to_process()) as to_process:
+        writer = csv.writer(out_file)
+        if not append:
+            writer.writerow(_RESULT_FIELDS)
+
+        while True:
+            # Check credit limit before making API calls - a window never holds more
+            # lookups than credits left, so concurrent matches can't overshoot it
+            credits_left = effective_limit - stats["credits_used"]
+            if credits_left <= 0:
+                print(f"\n[STOP] Credit limit reached: {stats['credits_used']} credits used")
+                break
+            window = list(islice(to_process, min(batch_size, credits_left)))
+            if not window:
+                break
+
+            # pool.map yields in input order, so the output CSV keeps the input's row order
+            for result, cached in pool.map(enrich_row, window):
+                writer.writerow([getattr(result, name) for name in _RESULT_FIELDS])
+
+                # Update stats
+                stats["processed"] += 1
+                if cached:
+                    stats["cache_hits"] += 1
+                if result.apollo_id:
+                    stats["matched"] += 1
+                    if not cached:
+                        stats["credits_used"] += 1
+                if result.email:
+                    stats["emails_found"] += 1
+                if result.phone or result.mobile_phone:
+                    stats["phones_found"] += 1
+                if result.api_error:
+                    stats["errors"] += 1
+
+            # Progress reporting
             elapsed = (datetime.now() - start_time).seconds
             rate = stats["processed"] / max(elapsed, 1)
-            print(f"  Processed: {stats['processed']}/{len(to_process)} "
+            print(f"  Processed: {stats['processed']}/{to_process_count} "
                   f"| Matched: {stats['matched']} "
                   f"| Emails: {stats['emails_found']} "
+                  f"| Cached: {stats['cache_hits']} "
                   f"| Rate: {rate:.1f}/sec")
 
-            # Write intermediate results
-            with open(output_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=output_fields)
-                writer.writeheader()
-                writer.writerows(results)
-
-        # Rate limiting
-        if i < len(to_process) - 1:
-            time.sleep(delay)
-
-    # Final write
-    with open(output_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=output_fields)
-        writer.writeheader()
-        writer.writerows(results)
+            # Checkpoint this window's rows so an interrupted run can resume
+            out_file.flush()
+            os.fsync(out_file.fileno())
 
-    # Record credits used
-    if stats["matched"] > 0:
-        record_credits(stats["matched"], str(input_path.name))
+    # Record credits used - cache hits were not billed
+    if stats["credits_used"] > 0:
+        record_credits(stats["credits_used"], str(input_path.name))
 
     new_remaining = get_remaining_budget()
 
@@ -488,7 +670,8 @@ def enrich_csv(
     print(f"  Matches: {stats['matched']} ({stats['matched']/max(stats['processed'],1)*100:.1f}%)")
     print(f"  Emails found: {stats['emails_found']} ({stats['emails_found']/max(stats['processed'],1)*100:.1f}%)")
     print(f"  Phones found: {stats['phones_found']} ({stats['phones_found']/max(stats['processed'],1)*100:.1f}%)")
-    print(f"\n  Credits used: {stats['matched']}")
+    print(f"  Cache hits: {stats['cache_hits']}")
+    print(f"\n  Credits used: {stats['credits_used']}")
     print(f"  Remaining budget: {new_remaining:,} credits")
 
     return stats
@@ -542,6 +725,14 @@ def test_single(name: str, city: str, state: str):
     print(json.dumps(response, indent=2))
 
 
+def positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Enrich dental records with Apollo.io data",
@@ -574,12 +765,16 @@ Examples:
     parser.add_argument('--city', help='City for test lookup')
     parser.add_argument('--state', help='State for test lookup')
     parser.add_argument('--batch-size', type=int, default=50, help='Progress report interval')
-    parser.add_argument('--delay', type=float, default=0.5, help='Delay between API calls (seconds)')
+    parser.add_argument('--delay', type=float, default=0.5, help='Minimum delay between API call starts (seconds)')
+    parser.add_argument('--concurrency', type=positive_int, default=4, help='Max API calls in flight at once')
     parser.add_argument('--limit', type=int, help='Max records to process (attempts)')
     parser.add_argument('--max-credits', type=int, help='Override: stop after N credits (ignores budget)')
     parser.add_argument('--dry-run', action='store_true', help='Preview without calling API')
     parser.add_argument('--no-resume', action='store_true', help='Start fresh, ignore existing output')
     parser.add_argument('--usage', action='store_true', help='Show current credit usage and exit')
+    parser.add_argument('--no-cache', action='store_true', help='Always call Apollo, ignoring cached responses')
+    parser.add_argument('--cache-ttl-days', type=float, default=DEFAULT_CACHE_TTL_DAYS,
+                        help='Reuse cached responses up to this many days old')
 
     args = parser.parse_args()
 
@@ -602,6 +797,9 @@ Examples:
             max_credits=args.max_credits,
             dry_run=args.dry_run,
             resume=not args.no_resume,
+            concurrency=args.concurrency,
+            use_cache=not args.no_cache,
+            cache_ttl_days=args.cache_ttl_days,
         )
     else:
         parser.print_help()
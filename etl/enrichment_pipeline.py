@@ -1,7 +1,12 @@
-from typing import Dict, List, Optional
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from utils.db_adapter import get_db
 
+# One row of the fetch query, in SELECT column order
+ProviderRow = namedtuple('ProviderRow', ['provider_id', 'npi', 'practice_name', 'city', 'state'])
+
 class EnrichmentPipeline:
     """
     Enrichment waterfall for external data sources
@@ -22,25 +27,34 @@ class EnrichmentPipeline:
             'clay': self._enrich_clay,
         }
     
-    def _enrich_wiza(self, provider_id: str, data: Dict) -> Optional[Dict]:
+    def _enrich_wiza(self, row: ProviderRow) -> Optional[Dict]:
         """Enrich using Wiza API"""
         # TODO: Implement Wiza API call
-        print(f"📧 Wiza enrichment for {provider_id}")
+        print(f"📧 Wiza enrichment for {row.provider_id}")
         return None
     
-    def _enrich_apollo(self, provider_id: str, data: Dict) -> Optional[Dict]:
+    def _enrich_apollo(self, row: ProviderRow) -> Optional[Dict]:
         """Enrich using Apollo API"""
         # TODO: Implement Apollo API call
-        print(f"🌐 Apollo enrichment for {provider_id}")
+        print(f"🌐 Apollo enrichment for {row.provider_id}")
         return None
     
-    def _enrich_clay(self, provider_id: str, data: Dict) -> Optional[Dict]:
+    def _enrich_clay(self, row: ProviderRow) -> Optional[Dict]:
         """Enrich using Clay waterfall"""
         # TODO: Implement Clay API call
-        print(f"🎯 Clay enrichment for {provider_id}")
+        print(f"🎯 Clay enrichment for {row.provider_id}")
         return None
     
-    def run(self, batch_size: int = 100):
+    def _waterfall(self, row: ProviderRow) -> Tuple[ProviderRow, Optional[str], Optional[Dict]]:
+        """Try each provider in priority order, stopping at the first hit"""
+        for provider_name, enrich_func in self.providers.items():
+            enriched_data = enrich_func(row)
+            if enriched_data:
+                return row, provider_name, enriched_data
+        
+        return row, None, None
+    
+    def run(self, batch_size: int = 100, max_workers: int = 8):
         """
         Run enrichment waterfall on un-enriched records
         
@@ -49,16 +63,20 @@ class EnrichmentPipeline:
         2. Try each enrichment provider in priority order
         3. Stop at first successful enrichment
         4. Write results to ENRICHED.PROVIDERS_MASTER
+        
+        Records are independent, so their waterfalls run on a thread pool -
+        the provider calls are network-bound and overlap instead of queueing.
         """
         print(f"🚀 Starting enrichment pipeline at {datetime.now()}")
         
         with get_db() as db:
-            # Fetch un-enriched records
+            # Fetch un-enriched records (anti-join, so the filter is a single hash join)
             fetch_sql = f"""
-            SELECT provider_id, npi, practice_name, city, state
-            FROM CLEAN.PROVIDERS_VALIDATED
-            WHERE provider_id NOT IN (SELECT provider_id FROM ENRICHED.PROVIDERS_MASTER)
-            LIMIT {batch_size}
+            SELECT c.provider_id, c.npi, c.practice_name, c.city, c.state
+            FROM CLEAN.PROVIDERS_VALIDATED c
+            LEFT JOIN ENRICHED.PROVIDERS_MASTER e USING (provider_id)
+            WHERE e.provider_id IS NULL
+            LIMIT {int(batch_size)}
             """
             
             records = db.execute(fetch_sql)
@@ -70,23 +88,14 @@ class EnrichmentPipeline:
             print(f"📋 Enriching {len(records)} records")
             
             enriched_count = 0
-            for record in records:
-                provider_id = record[0]
-                data = dict(zip(['provider_id', 'npi', 'practice_name', 'city', 'state'], record))
-                
-                # Try each provider in waterfall order
-                enriched_data = None
-                provider_used = None
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(self._waterfall, ProviderRow._make(record)) for record in records]
                 
-                for provider_name, enrich_func in self.providers.items():
-                    enriched_data = enrich_func(provider_id, data)
+                for future in as_completed(futures):
+                    row, provider_used, enriched_data = future.result()
                     if enriched_data:
-                        provider_used = provider_name
                         enriched_count += 1
-                        break
-                
-                if enriched_data:
-                    print(f"✅ Enriched {provider_id} using {provider_used}")
+                        print(f"✅ Enriched {row.provider_id} using {provider_used}")
             
             print(f"✅ Enrichment complete: {enriched_count}/{len(records)} records enriched")
 
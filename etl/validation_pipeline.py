@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime
 from utils.db_adapter import get_db
@@ -70,7 +71,7 @@ class ValidationPipeline:
             'formatted_number': phone_number
         }
     
-    def run(self, batch_size: int = 1000):
+    def run(self, batch_size: int = 1000, max_workers: int = 20):
         """
         Run validation pipeline on unvalidated records
         
@@ -79,6 +80,10 @@ class ValidationPipeline:
         2. Validate addresses (Addy)
         3. Validate phones (Twilio)
         4. Write results back to CLEAN.VALIDATED_CONTACTS
+        
+        The address and phone lookups hit different vendors and don't depend
+        on each other, so both are submitted to a thread pool up front - each
+        record costs max(addy, twilio) instead of the sum.
         """
         print(f"🔍 Starting validation pipeline at {datetime.now()}")
         
@@ -93,7 +98,7 @@ class ValidationPipeline:
                 zip_code,
                 phone
             FROM CLEAN.PROVIDERS_UNVALIDATED
-            LIMIT {batch_size}
+            LIMIT {int(batch_size)}
             """
             
             records = db.execute(fetch_sql)
@@ -104,27 +109,32 @@ class ValidationPipeline:
             
             print(f"📋 Processing {len(records)} records")
             
-            # Validate each record
-            validated_records = []
-            for record in records:
-                provider_id, address, city, state, zip_code, phone = record
-                
-                # Validate address
-                addr_result = self.validate_address(address, city, state, zip_code)
-                
-                # Validate phone
-                phone_result = self.validate_phone(phone)
+            # Validate each record (address + phone lookups run concurrently)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = [
+                    (
+                        provider_id,
+                        executor.submit(self.validate_address, address, city, state, zip_code),
+                        executor.submit(self.validate_phone, phone),
+                    )
+                    for provider_id, address, city, state, zip_code, phone in records
+                ]
                 
-                validated_records.append((
-                    provider_id,
-                    addr_result['normalized_address'],
-                    addr_result['confidence_score'],
-                    phone_result['formatted_number'],
-                    phone_result['line_type'],
-                    phone_result['carrier']
-                ))
+                validated_records = []
+                for provider_id, addr_future, phone_future in pending:
+                    addr_result = addr_future.result()
+                    phone_result = phone_future.result()
+                    
+                    validated_records.append((
+                        provider_id,
+                        addr_result['normalized_address'],
+                        addr_result['confidence_score'],
+                        phone_result['formatted_number'],
+                        phone_result['line_type'],
+                        phone_result['carrier']
+                    ))
             
-            # Insert validated records
+            # Insert validated records (one batched executemany for the whole batch)
             insert_sql = """
             INSERT INTO CLEAN.VALIDATED_CONTACTS 
             (provider_id, normalized_address, address_confidence, 
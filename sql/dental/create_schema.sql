@@ -34,3 +34,18 @@ INSERT INTO CLEAN.DENTAL_TAXONOMY_CODES (taxonomy_code, specialty_name, descript
 -- Verify reference table
 SELECT * FROM CLEAN.DENTAL_TAXONOMY_CODES ORDER BY specialty_name;
 
+
+-- US states + DC reference table (excludes territories)
+-- Dashboards semi-join against this instead of inlining the state list; it only
+-- changes when this script runs, so Snowflake's result cache stays valid
+CREATE OR REPLACE TABLE CLEAN.US_STATES (
+    state VARCHAR(2) PRIMARY KEY
+);
+
+INSERT INTO CLEAN.US_STATES (state) VALUES
+    ('AL'), ('AK'), ('AZ'), ('AR'), ('CA'), ('CO'), ('CT'), ('DE'), ('FL'), ('GA'),
+    ('HI'), ('ID'), ('IL'), ('IN'), ('IA'), ('KS'), ('KY'), ('LA'), ('ME'), ('MD'),
+    ('MA'), ('MI'), ('MN'), ('MS'), ('MO'), ('MT'), ('NE'), ('NV'), ('NH'), ('NJ'),
+    ('NM'), ('NY'), ('NC'), ('ND'), ('OH'), ('OK'), ('OR'), ('PA'), ('RI'), ('SC'),
+    ('SD'), ('TN'), ('TX'), ('UT'), ('VT'), ('VA'), ('WA'), ('WV'), ('WI'), ('WY'),
+    ('DC');
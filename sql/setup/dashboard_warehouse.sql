@@ -0,0 +1,38 @@
+-- ============================================================================
+-- Warehouse Settings for the Streamlit Dashboards
+-- ============================================================================
+-- Run this script as ACCOUNTADMIN (or the COMPUTE_WH owner). The dashboards fan
+-- their load queries out over concurrent cursors and rely on the 24h query
+-- result cache; these settings keep both effective.
+--
+-- COMPUTE_WH is the dashboards' configured warehouse (SNOWFLAKE_WAREHOUSE /
+-- [snowflake] warehouse in secrets.toml). If a deployment points them at a
+-- different warehouse, replace COMPUTE_WH below with that name. DL_WH is the
+-- Hex warehouse (hex_user_setup.sql) and is not touched here.
+-- ============================================================================
+
+USE ROLE ACCOUNTADMIN;
+
+-- ============================================================================
+-- 1. Concurrency
+-- ============================================================================
+-- client_dashboard.py submits its six load queries at once. 8 is Snowflake's
+-- default - pinning it restores the default if the warehouse was tuned down,
+-- so the queries run side by side instead of queueing.
+ALTER WAREHOUSE COMPUTE_WH SET MAX_CONCURRENCY_LEVEL = 8;
+
+-- Several sessions cold-loading at once can still queue. On Enterprise
+-- edition, let the warehouse add clusters instead:
+-- ALTER WAREHOUSE COMPUTE_WH SET MIN_CLUSTER_COUNT = 1 MAX_CLUSTER_COUNT = 2 SCALING_POLICY = 'STANDARD';
+
+-- ============================================================================
+-- 2. Result Cache
+-- ============================================================================
+-- The dashboards also set USE_CACHED_RESULT per session. Setting it as a user
+-- default covers any other client that runs the same SQL text.
+-- ALTER USER <dashboard_user> SET USE_CACHED_RESULT = TRUE;
+
+-- ============================================================================
+-- 3. Verification
+-- ============================================================================
+SHOW PARAMETERS LIKE 'MAX_CONCURRENCY_LEVEL' IN WAREHOUSE COMPUTE_WH;
@@ -0,0 +1,39 @@
+-- ============================================================================
+-- CLEAN.US_STATES Reference Table (migration)
+-- ============================================================================
+-- The dashboards filter every query with STATE IN (SELECT STATE FROM
+-- CLEAN.US_STATES). Fresh setups get the table from sql/dental/create_schema.sql;
+-- run this script once on an existing deployment before rolling out the
+-- dashboard change. Safe to re-run - it creates the table only if missing and
+-- only inserts states that aren't there yet.
+-- ============================================================================
+
+USE DATABASE DENTAL_LEADS;
+
+-- ============================================================================
+-- 1. Table
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS CLEAN.US_STATES (
+    state VARCHAR(2) PRIMARY KEY
+);
+
+-- ============================================================================
+-- 2. US states + DC (excludes territories)
+-- ============================================================================
+MERGE INTO CLEAN.US_STATES t
+USING (
+    SELECT column1 AS state FROM VALUES
+        ('AL'), ('AK'), ('AZ'), ('AR'), ('CA'), ('CO'), ('CT'), ('DE'), ('FL'), ('GA'),
+        ('HI'), ('ID'), ('IL'), ('IN'), ('IA'), ('KS'), ('KY'), ('LA'), ('ME'), ('MD'),
+        ('MA'), ('MI'), ('MN'), ('MS'), ('MO'), ('MT'), ('NE'), ('NV'), ('NH'), ('NJ'),
+        ('NM'), ('NY'), ('NC'), ('ND'), ('OH'), ('OK'), ('OR'), ('PA'), ('RI'), ('SC'),
+        ('SD'), ('TN'), ('TX'), ('UT'), ('VT'), ('VA'), ('WA'), ('WV'), ('WI'), ('WY'),
+        ('DC')
+) s
+ON t.state = s.state
+WHEN NOT MATCHED THEN INSERT (state) VALUES (s.state);
+
+-- ============================================================================
+-- 3. Verification (expect 51)
+-- ============================================================================
+SELECT COUNT(*) AS state_count FROM CLEAN.US_STATES;
@@ -28,7 +28,7 @@ class SnowflakeClient:
     - Automatic cleanup
     """
     
-    def __init__(self):
+    def __init__(self, keep_alive: bool = False):
         # Import here to avoid circular dependency
         from utils.secrets_manager import get_secrets_manager
         
@@ -63,6 +63,9 @@ class SnowflakeClient:
             else:
                 logger.warning("⚠️  No RSA key or password found - connection may fail")
         
+        # Long-lived callers (dashboards caching one client per process) heartbeat the
+        # session so it isn't expired server-side between queries
+        self.keep_alive = keep_alive
         self._conn = None
         
         logger.info(f"✅ SnowflakeClient initialized for account: {self.account}")
@@ -130,6 +133,7 @@ class SnowflakeClient:
                         database=self.database,
                         schema=self.schema,
                         role=self.role,
+                        client_session_keep_alive=self.keep_alive,
                     )
                     logger.info("✅ Snowflake connection established with RSA key")
                     return self._conn
@@ -148,6 +152,7 @@ class SnowflakeClient:
                         database=self.database,
                         schema=self.schema,
                         role=self.role,
+                        client_session_keep_alive=self.keep_alive,
                     )
                     logger.info("✅ Snowflake connection established with password")
                     return self._conn
@@ -208,19 +213,23 @@ class SnowflakeClient:
             logger.error(f"❌ Batch execution failed: {e}")
             raise
     
-    def fetch_df(self, sql: str):
+    def fetch_df(self, sql: str, params: Optional[Dict[str, Any]] = None):
         """
         Execute SQL and return pandas DataFrame.
         
+        Results are fetched in Arrow format and converted column-wise, so no
+        per-row Python tuples are built along the way.
+        
         Args:
             sql: SQL query to execute
+            params: Optional query parameters
         
         Returns:
             pandas DataFrame with query results
         """
         try:
             cursor = self.conn.cursor()
-            cursor.execute(sql)
+            cursor.execute(sql, params or {})
             df = cursor.fetch_pandas_all()
             cursor.close()
             logger.info(f"✅ DataFrame fetched: {len(df)} rows, {len(df.columns)} columns")